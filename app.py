@@ -1,63 +1,96 @@
 import os
-import pickle
+import random
 import re
 import json
 import time
+import queue
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from datetime import datetime, timedelta, timezone
 import structlog
 logger = structlog.get_logger(__name__)
 
 #  TIMEZONE FALLBACK ─
+_TZ = None
+
 def get_tz():
     """
     Returns a robust timezone object for Asia/Kolkata (UTC+5:30).
     Avoids NameError if zoneinfo or backports.zoneinfo is missing.
+    Resolved once — ZoneInfo construction hits tzdata on disk, and this
+    runs inside every date/time extraction.
     """
-    try:
-        from zoneinfo import ZoneInfo
-        return ZoneInfo("Asia/Kolkata")
-    except ImportError:
+    global _TZ
+    if _TZ is None:
         try:
-            from backports.zoneinfo import ZoneInfo
-            return ZoneInfo("Asia/Kolkata")
+            from zoneinfo import ZoneInfo
+            _TZ = ZoneInfo("Asia/Kolkata")
         except ImportError:
-            # Absolute fallback: Manual UTC+5:30 offset
-            from datetime import timezone
-            return timezone(timedelta(hours=5, minutes=30))
-
-AUDIO_BACKEND = "sounddevice"
-TTS_AVAILABLE = True
+            try:
+                from backports.zoneinfo import ZoneInfo
+                _TZ = ZoneInfo("Asia/Kolkata")
+            except ImportError:
+                # Absolute fallback: Manual UTC+5:30 offset
+                _TZ = timezone(timedelta(hours=5, minutes=30))
+    return _TZ
+
+# Availability flags are resolved without importing — the audio stack
+# (sounddevice/scipy/pyttsx3/numpy) costs seconds of startup and ~200 MB RSS,
+# so text-mode runs should never pay for it. The modules themselves are
+# imported lazily by _import_voice_backends() on first voice use.
+from importlib.util import find_spec as _find_spec
+
+AUDIO_BACKEND = "sounddevice" if _find_spec("sounddevice") else None
+TTS_AVAILABLE = _find_spec("pyttsx3") is not None
+VAD_AVAILABLE = _find_spec("webrtcvad") is not None
+VOSK_AVAILABLE = _find_spec("vosk") is not None
+SPEECH_RECOGNITION_AVAILABLE = _find_spec("speech_recognition") is not None
+
+# Bound by _import_voice_backends() when voice mode is actually used.
+sd = np = pyttsx3 = sr = webrtcvad = None
+
+
+def _import_voice_backends():
+    """Import the heavy audio stack on first voice use instead of at module
+    import time."""
+    global sd, np, pyttsx3, sr, webrtcvad
+    if sd is not None:
+        return
+    import sounddevice as _sd
+    import numpy as _np
+    import pyttsx3 as _pyttsx3
+    sd, np, pyttsx3 = _sd, _np, _pyttsx3
+    if SPEECH_RECOGNITION_AVAILABLE:
+        import speech_recognition as _sr
+        sr = _sr
+    if VAD_AVAILABLE:
+        import webrtcvad as _webrtcvad
+        webrtcvad = _webrtcvad
 
-try:
-    import sounddevice as sd
-    from scipy.io import wavfile
-except ImportError:
-    AUDIO_BACKEND = None
 
 try:
-    import pyttsx3
-    TTS_AVAILABLE = True
+    import orjson as _fast_json   # optional — 2-3x faster C JSON parser
 except ImportError:
-    TTS_AVAILABLE = False
+    _fast_json = None
 
 import requests
-from googleapiclient.discovery import build
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from google.auth.exceptions import RefreshError
 from google_sheets_manager import GoogleSheetsManager
 from vector_db_manager import VectorDBManager
 
-try:
-    import speech_recognition as sr
-    SPEECH_RECOGNITION_AVAILABLE = True
-except ImportError:
-    SPEECH_RECOGNITION_AVAILABLE = False
-
 #  CONFIG
 OLLAMA_BASE_URL          = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-OLLAMA_MODEL             = os.getenv("OLLAMA_MODEL", "qwen2.5:3b")
+#  JSON slot-filling doesn't need a 3B model: the 1.5B instruct quant parses
+#  the same fields at roughly half the decode latency. Override with
+#  OLLAMA_MODEL to trade speed back for headroom.
+OLLAMA_MODEL             = os.getenv("OLLAMA_MODEL", "qwen2.5:1.5b-instruct-q4_K_M")
+
+#  Persistent keep-alive connection to Ollama — a fresh requests.post opens a
+#  new TCP socket per turn; reusing one session keeps the socket warm.
+_OLLAMA_SESSION = requests.Session()
+_OLLAMA_SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4))
 SCOPES = [
     "https://www.googleapis.com/auth/calendar",
     "https://www.googleapis.com/auth/spreadsheets",
@@ -68,11 +101,23 @@ SAMPLE_RATE              = 16000
 DURATION                 = 3
 LLM_TIMEOUT_SECONDS      = 10
 # Context window and word count configuration
-LLM_NUM_CTX              = 2048   
-LLM_NUM_PREDICT          = 150    
+LLM_NUM_CTX              = 2048
+LLM_NUM_PREDICT          = 150
+LLM_CACHE_MAX            = 256    # exact-match parse cache entries per agent
 OPEN_HOUR                = 9    # 9 AM
 CLOSE_HOUR               = 17   # 5 PM
 
+#  Business-hours bitmap: bit (weekday*24 + hour) is set when the clinic is
+#  open — Mon-Sat 9-17 minus the 13:00 lunch hour, Sundays closed. The
+#  per-booking check collapses to one shift+AND instead of chained
+#  comparisons, and the schedule reads as data rather than branches.
+_BIZ_MASK = 0
+for _wd in range(6):                       # Mon..Sat
+    for _h in range(OPEN_HOUR, CLOSE_HOUR):
+        if _h != 13:                       # lunch break 1-2 PM
+            _BIZ_MASK |= 1 << (_wd * 24 + _h)
+del _wd, _h
+
 #  LOGIC LOADER
 def load_logic():
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -87,45 +132,232 @@ def load_logic():
 LOGIC            = load_logic()
 FAQ_DATABASE     = {}                              # LLM handles FAQ now
 _INTENT_PATTERNS = LOGIC.get("intent_patterns", {})
+#  Compile the logic.json intent table once — fast_extract_intent runs on
+#  every utterance and should not pay re-cache lookups per pattern.
+_INTENT_COMPILED = [
+    (intent, tuple(re.compile(p) for p in patterns))
+    for intent, patterns in _INTENT_PATTERNS.items()
+]
+#  Tamil and Hindi intent patterns (Unicode + transliteration), checked in
+#  order after the English table.
+_INTENT_MULTILINGUAL = [
+    (re.compile(
+        r'(பதிவு\s+செய்|புக்\s+பண்ண|appointment\s+வேண்டும்|அப்பாயின்மெண்ட்|'
+        r'book\s+pannanum|appointment\s+pannanum|panna\s+venum|'
+        r'நியமனம்\s+வேண்டும்|appointment\s+panna\s+venum|'
+        r'pannanum|pannunga)'), 'book'),
+    (re.compile(r'(ரத்து|cancel\s+பண்ண|நியமனம்\s+ரத்து)'), 'cancel'),
+    (re.compile(r'(நேரம்\s+மாற்ற|மாற்ற\s+வேண்டும்|reschedule\s+பண்ண|date\s+மாற்ற)'), 'reschedule'),
+    (re.compile(r'(appointment\s+பார்க்க|நியமனம்\s+பார்க்க|எப்போது\s+appointment)'), 'view_appointments'),
+    (re.compile(
+        r'(appointment\s+बुक|बुक\s+करन|appointment\s+चाहिए|appointment\s+लेन|'
+        r'book\s+karna|book\s+karo|appointment\s+chahiye|'
+        r'appointment\s+lena|book\s+karein|appointment\s+book)'), 'book'),
+    (re.compile(r'(रद्द|cancel\s+करन|appointment\s+रद्द)'), 'cancel'),
+    (re.compile(r'(appointment\s+बदल|समय\s+बदल|reschedule\s+करन)'), 'reschedule'),
+]
 PROMPTS          = LOGIC.get("prompts", {})
 SYSTEM_MESSAGES  = LOGIC.get("system_messages", {})
+#  Flattened (keyword, answer) pairs — the per-turn FAQ scan walks this flat
+#  tuple instead of re-traversing the nested logic.json dict every utterance.
+_FAQ_KEYWORD_ANSWERS = tuple(
+    (kw, faq["answer"])
+    for faq in LOGIC.get("faq_database", {}).values()
+    for kw in faq.get("keywords", [])
+    if faq.get("answer")
+)
 
 # ─
 #  FAST KEYWORD EXTRACTORS  (<1 ms, no LLM)
 # ─
 
+#  Precompiled patterns — compiled once at import so the hot extract path
+#  never pays re.compile / pattern-build costs per utterance.
+_MONTHS = {
+    'jan':1,'feb':2,'mar':3,'apr':4,'may':5,'jun':6,
+    'jul':7,'aug':8,'sep':9,'oct':10,'nov':11,'dec':12,
+    'january':1,'february':2,'march':3,'april':4,'june':6,
+    'july':7,'august':8,'september':9,'october':10,'november':11,'december':12,
+}
+_WEEKDAYS = {
+    'monday':0, 'tuesday':1, 'wednesday':2, 'thursday':3, 'friday':4, 'saturday':5, 'sunday':6,
+    'mon':0, 'tue':1, 'wed':2, 'thu':3, 'fri':4, 'sat':5, 'sun':6
+}
+_DATE_TODAY_RE     = re.compile(r'\btoday\b')
+_DATE_TOMORROW_RE  = re.compile(r'\b(tomorrow|tommorow|tommorrow|tomorow)\b')
+_DATE_DAY_AFTER_RE = re.compile(r'\bday\s+after\s+(tomorrow|tommorow|tommorrow|tomorow)\b')
+_DATE_DMY_RE       = re.compile(r'\b(\d{1,2})[\/\-](\d{1,2})[\/\-](\d{2,4})\b')
+_DATE_ISO_RE       = re.compile(r'\b(\d{4})-(\d{2})-(\d{2})\b')
+# One precise month alternation shared by both date shapes — matches the full
+# or abbreviated month name only, so e.g. 'maybe' no longer matches 'may'.
+_MONTH_ALT = (
+    r'(?P<mon>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|'
+    r'jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)'
+)
+_DATE_DAY_MONTH_RE = re.compile(
+    r'\b(\d{1,2})(?:\s*(?:st|nd|rd|th))?\s*(?:of|the|tha)?\s*' + _MONTH_ALT + r'\b',
+    re.IGNORECASE
+)
+_DATE_MONTH_DAY_RE = re.compile(
+    r'\b' + _MONTH_ALT + r'\s*'
+    r'(?:the|tha)?\s*(\d{1,2})(?:\s*(?:st|nd|rd|th))?\b',
+    re.IGNORECASE
+)
+_DATE_WEEKDAY_RE = re.compile(
+    r'\b(?P<next>next\s+)?(monday|tuesday|wednesday|thursday|friday|saturday|sunday|mon|tue|wed|thu|fri|sat|sun)\b',
+    re.IGNORECASE
+)
+
+_TIME_AMPM_NORM_RE  = re.compile(r'\b([ap])\.?m\.?\b', re.IGNORECASE)
+_TIME_FILLER_RE     = re.compile(r'\b(at|on|for|the|in)\b', re.IGNORECASE)
+_TIME_RE_12H        = re.compile(r'\b(\d{1,2}):(\d{2})\s*([AP]M)\b')
+_TIME_RE_HOUR_AMPM  = re.compile(r'\b(\d{1,2})\s*([AP]M)\b')
+_TIME_PERIOD_RE     = re.compile(r'\b(\d{1,2})(?::(\d{2}))?\s*(?:in\s+the\s+)?(morning|afternoon|evening|night)\b')
+_TIME_RE_24H        = re.compile(r'\b(\d{1,2}):(\d{2})\b')
+
+
+class _KeepDigitsTable(dict):
+    """translate() table that keeps digits and deletes every other char."""
+    def __missing__(self, key):
+        return None
+
+_DIGITS_ONLY = _KeepDigitsTable({ord(c): c for c in "0123456789"})
+
+#  Patient-type patterns (English typo-tolerant + Tamil/Hindi)
+_PATIENT_NEW_RES = tuple(re.compile(p) for p in (
+    r'\bnew\s*patient\b',
+    r'\bi\s+am\s+new\b',
+    r'\bfirst.?time\b',
+    r'\bfirst\s+visit\b',
+    r'\bnever\b.{0,20}(been|visit|come)',
+    r'\bnot\b.{0,20}(old|exist|register)',
+    r'\bdon.t\s+have\b.{0,20}(id|account)',
+    r'\bno\s+id\b',
+    r'^new(\s+patient)?$',
+))
+_PATIENT_OLD_RES = tuple(re.compile(p) for p in (
+    r'\bex[ise]{0,3}[ts][tin]{0,3}[gi]?\w*\b',
+    r'\bold\s*patient\b',
+    r'\bi\s+am\s+old\b',
+    r'\balready\s+(registered|a\s+patient|have)\b',
+    r'\breturn\w*\s+patient\b',
+    r'\bhave\b.{0,20}(customer\s*id|patient\s*id|cust\s*id)',
+    r'\bbeen\s+here\s+before\b',
+    r'\bregistered\s+patient\b',
+    r'\bcame\s+before\b',
+    r'\bvisited\s+before\b',
+    r'\bmy\s+(customer\s*)?id\s+is\b',
+    r'\bcust\s*\d',
+    r'\bprevious\s+patient\b',
+    r'^(old|existing)$',
+))
+_PATIENT_ML_RES = [
+    (re.compile(r'(புதிய\s+நோயாளி|புதிய\s+patient|முதல்\s+முறை|pudhiya)'), 'new'),
+    (re.compile(
+        r'(பழைய\s+நோயாளி|பழைய\s+patient|முன்பு\s+வந்(தேன்|திருக்கிறேன்)|'
+        r'உங்கள்\s+கிளினிக்கின்|முன்னாடி\s+வந்தேன்)'), 'old'),
+    (re.compile(r'(नया\s+मरीज|नया\s+patient|पहली\s+बार)'), 'new'),
+    (re.compile(r'(पुराना\s+मरीज|पुराना\s+patient|पहले\s+आया|पहले\s+आई)'), 'old'),
+]
+
+#  Customer-ID shapes, most to least explicit
+_CUST_ID_RES = (
+    re.compile(r'\bCUST[\s\-]?(\d{1,4})\b', re.IGNORECASE),
+    re.compile(r'\b(?:customer\s*)?(?:id|number|no|num)[\s\-:]*(?:is\s*)?(\d{1,4})\b', re.IGNORECASE),
+    re.compile(r'\b(?:my|it|the)\s+(?:\w+\s+)?is\s+(\d{1,4})\b', re.IGNORECASE),
+)
+_CUST_BARE_NUM_RE = re.compile(r'\b(\d{1,4})\b')
+_ANY_NUM_RE       = re.compile(r'(\d{1,4})')
+
+#  Name introductions (English + Tamil + Hindi) and a bare-name shape
+_NAME_INTRO_RE = re.compile(
+    r'\b(?:my\s+name\s+is|name\s*[:\-]\s*|this\s+is|call\s+me|name\s+is|i\s*am|i\s*m|myself)\s+'
+    r'([A-Za-z]+(?:\s+[A-Za-z]{2,})?)',
+    re.IGNORECASE
+)
+_NAME_TA_RE = re.compile(
+    r'(?:நான்\s+|என்\s+பெயர்\s+|என்னுடைய\s+பெயர்\s+)([A-Za-z][A-Za-z\s]{1,30})(?:\s+பேசுகிறேன்|$)'
+)
+_NAME_HI_RE = re.compile(
+    r'(?:मेरा\s+नाम\s+|मैं\s+)([A-Za-z][A-Za-z\s]{1,30})(?:\s+है|\s+बोल\s+रहा|$)'
+)
+_NAME_PLAIN_RE = re.compile(r'^[A-Za-z]+(?:\s+[A-Za-z]+)?$')
+
+#  Filler phrases stripped off a spoken visit reason
+_REASON_FILLER_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\bmy\s+name\s+is\b',
+    r'\bi\s+am\s+called\b',
+    r'\bi\s+am\b',
+    r'\bthis\s+is\b',
+    r'\bi\s+is\b',
+    r'\bi\s+(have|need|want|got)\s+(a|an)?\b',
+    r'\bi\s+(need|want)\s+to\s+(book|schedule|see)\b',
+    r'\bappointment\s+for\b',
+    r'\breason\s+is\b',
+    r'\bfor\s+my\b',
+    r'\bi\s+am\s+having\b',
+    r'\bplease\b',
+    r'\btoday\b',
+    r'\btomorrow\b',
+    r'\bhere\b',
+    r'\bkindly\b',
+))
+
+#  Yes / no affirmations (English + Tamil + Hindi)
+_YES_RE = re.compile(
+    r'\b(yes|yeah|yep|yup|yea|ya|correct|confirm|confirmed|confirming|ok|okay|'
+    r'sure|go\s+ahead|proceed|sounds\s+good|right|perfect|'
+    r'looks\s+good|book\s+it|book\s+the\s+appointment|do\s+it|fine|'
+    r'absolutely|definitely|please|just\s+do\s+it|that\s+is\s+it)\b'
+)
+_YES_ML_RES = (
+    re.compile(r'(ஆம்|சரி|ஓகே|சரிதான்|ஆமாம்)'),
+    re.compile(r'(हाँ|हां|ठीक\s*है|बिल्कुल|हाँ\s*जी)'),
+)
+_NO_RE = re.compile(
+    r'\b(no|nope|nah|naa|wrong|change|edit|different|incorrect|'
+    r'not\s+right|modify|update|fix|cancel\s+that|wait|none|'
+    r'something\s+else|different\s+time|other|other\s+times?)\b'
+)
+_NO_ML_RES = (
+    re.compile(r'(வேண்டாம்|வேண்டா|இல்லை)'),
+    re.compile(r'(नहीं|नही|मत)'),
+)
+
+#  End-of-conversation phrases — one alternation so detection is a single
+#  scan of the utterance instead of a pass per pattern
+_GOODBYE_RE = re.compile("|".join((
+    r'\b(?:thank|thanks|thank you)\b',
+    r'\b(?:bye|goodbye|ttyl|see you|nothing else|no more|that is it|that\'s it)\b',
+    r'\b(?:no\s+thank\s*s?|no\s+i\s+am\s+good|im\s+good|nothing\s+else|nothing)\b',
+    r'^nothing$', r'^no$', r'^no\s*thanks?$', r'^that\s+is\s+it$', r'^that\'s\s+it$',
+)))
+
+#  CLI exit commands — word-bounded so spoken forms ("okay bye") also match
+_EXIT_RE = re.compile(r"\b(?:exit|quit|bye|goodbye)\b", re.I)
+
+#  LLM raw-output cleanup (fallback path when strict JSON parsing fails)
+_THINK_BLOCK_RE    = re.compile(r'<think>.*?</think>', re.DOTALL)
+_CODE_FENCE_RE     = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+_JSON_OBJECT_RE    = re.compile(r'\{.*\}', re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+
+#  Misc one-offs used by the calendar manager / appointment views
+_HOUR_AMPM_RE   = re.compile(r'(\d+)(AM|PM)')
+_DESC_REASON_RE = re.compile(r'Reason:\s*(.*)')
+
+
 def fast_extract_intent(text):
     t = text.lower().strip()
-    # English intent patterns (from logic.json)
-    for intent, patterns in _INTENT_PATTERNS.items():
+    # English intent patterns (from logic.json, precompiled at import)
+    for intent, patterns in _INTENT_COMPILED:
         for p in patterns:
-            if re.search(p, t):
+            if p.search(t):
                 return intent
-    # Tamil intent patterns (Unicode + transliteration)
-    if re.search(
-        r'(பதிவு\s+செய்|புக்\s+பண்ண|appointment\s+வேண்டும்|அப்பாயின்மெண்ட்|'
-        r'book\s+pannanum|appointment\s+pannanum|panna\s+venum|'
-        r'நியமனம்\s+வேண்டும்|appointment\s+panna\s+venum|'
-        r'pannanum|pannunga)', text
-    ):
-        return 'book'
-    if re.search(r'(ரத்து|cancel\s+பண்ண|நியமனம்\s+ரத்து)', text):
-        return 'cancel'
-    if re.search(r'(நேரம்\s+மாற்ற|மாற்ற\s+வேண்டும்|reschedule\s+பண்ண|date\s+மாற்ற)', text):
-        return 'reschedule'
-    if re.search(r'(appointment\s+பார்க்க|நியமனம்\s+பார்க்க|எப்போது\s+appointment)', text):
-        return 'view_appointments'
-    # Hindi intent patterns (Unicode + transliteration)
-    if re.search(
-        r'(appointment\s+बुक|बुक\s+करन|appointment\s+चाहिए|appointment\s+लेन|'
-        r'book\s+karna|book\s+karo|appointment\s+chahiye|'
-        r'appointment\s+lena|book\s+karein|appointment\s+book)', text
-    ):
-        return 'book'
-    if re.search(r'(रद्द|cancel\s+करन|appointment\s+रद्द)', text):
-        return 'cancel'
-    if re.search(r'(appointment\s+बदल|समय\s+बदल|reschedule\s+करन)', text):
-        return 'reschedule'
+    # Tamil + Hindi intent patterns (Unicode + transliteration, precompiled)
+    for p, intent in _INTENT_MULTILINGUAL:
+        if p.search(text):
+            return intent
     return None
 
 
@@ -140,71 +372,26 @@ def fast_patient_type(text):
     if len(words) > 8:
         return None
 
-    new_patterns = [
-        r'\bnew\s*patient\b',
-        r'\bi\s+am\s+new\b',
-        r'\bfirst.?time\b',
-        r'\bfirst\s+visit\b',
-        r'\bnever\b.{0,20}(been|visit|come)',
-        r'\bnot\b.{0,20}(old|exist|register)',
-        r'\bdon.t\s+have\b.{0,20}(id|account)',
-        r'\bno\s+id\b',
-    ]
-    for p in new_patterns:
-        if re.search(p, t):
+    for p in _PATIENT_NEW_RES:
+        if p.search(t):
             return 'new'
-    if re.match(r'^new$', t) or re.match(r'^new\s+patient$', t):
-        return 'new'
-
-    existing_patterns = [
-        r'\bex[ise]{0,3}[ts][tin]{0,3}[gi]?\w*\b',
-        r'\bold\s*patient\b',
-        r'\bi\s+am\s+old\b',
-        r'\balready\s+(registered|a\s+patient|have)\b',
-        r'\breturn\w*\s+patient\b',
-        r'\bhave\b.{0,20}(customer\s*id|patient\s*id|cust\s*id)',
-        r'\bbeen\s+here\s+before\b',
-        r'\bregistered\s+patient\b',
-        r'\bcame\s+before\b',
-        r'\bvisited\s+before\b',
-        r'\bmy\s+(customer\s*)?id\s+is\b',
-        r'\bcust\s*\d',
-        r'\bprevious\s+patient\b',
-    ]
-    for p in existing_patterns:
-        if re.search(p, t):
+    for p in _PATIENT_OLD_RES:
+        if p.search(t):
             return 'old'
-    if re.match(r'^(old|existing)$', t):
-        return 'old'
-
-    # Tamil patient type patterns (Unicode)
-    if re.search(r'(புதிய\s+நோயாளி|புதிய\s+patient|முதல்\s+முறை|pudhiya)', text):
-        return 'new'
-    if re.search(
-        r'(பழைய\s+நோயாளி|பழைய\s+patient|முன்பு\s+வந்(தேன்|திருக்கிறேன்)|'
-        r'உங்கள்\s+கிளினிக்கின்|முன்னாடி\s+வந்தேன்)', text
-    ):
-        return 'old'
-
-    # Hindi patient type patterns (Unicode)
-    if re.search(r'(नया\s+मरीज|नया\s+patient|पहली\s+बार)', text):
-        return 'new'
-    if re.search(r'(पुराना\s+मरीज|पुराना\s+patient|पहले\s+आया|पहले\s+आई)', text):
-        return 'old'
-
+    # Tamil / Hindi patient type patterns (Unicode)
+    for p, label in _PATIENT_ML_RES:
+        if p.search(text):
+            return label
     return None
 
 
 def fast_extract_customer_id(text, awaiting=False):
     t = text.strip()
-    m = re.search(r'\bCUST[\s\-]?(\d{1,4})\b', t, re.IGNORECASE)
-    if m: return f"CUST{m.group(1).zfill(3)}"
-    m = re.search(r'\b(?:customer\s*)?(?:id|number|no|num)[\s\-:]*(?:is\s*)?(\d{1,4})\b', t, re.IGNORECASE)
-    if m: return f"CUST{m.group(1).zfill(3)}"
-    m = re.search(r'\b(?:my|it|the)\s+(?:\w+\s+)?is\s+(\d{1,4})\b', t, re.IGNORECASE)
-    if m: return f"CUST{m.group(1).zfill(3)}"
+    for p in _CUST_ID_RES:
+        m = p.search(t)
+        if m: return f"CUST{m.group(1).zfill(3)}"
     if awaiting:
-        m = re.search(r'\b(\d{1,4})\b', t)
+        m = _CUST_BARE_NUM_RE.search(t)
         if m: return f"CUST{m.group(1).zfill(3)}"
     return None
 
@@ -212,10 +399,7 @@ def fast_extract_customer_id(text, awaiting=False):
 def fast_extract_name(text, awaiting=False):
     t = text.strip()
     # English: typical introduction phrases
-    m = re.search(
-        r'\b(?:my\s+name\s+is|name\s*[:\-]\s*|this\s+is|call\s+me|name\s+is|i\s*am|i\s*m|myself)\s+([A-Za-z]+(?:\s+[A-Za-z]{2,})?)',
-        t, re.IGNORECASE
-    )
+    m = _NAME_INTRO_RE.search(t)
     if m:
         raw_name = m.group(1).strip()
         name_parts = raw_name.split()
@@ -230,25 +414,19 @@ def fast_extract_name(text, awaiting=False):
         if len(name) >= 2: return name
 
     # Tamil: "நான் X பேசுகிறேன்" or "என் பெயர் X"
-    m = re.search(
-        r'(?:நான்\s+|என்\s+பெயர்\s+|என்னுடைய\s+பெயர்\s+)([A-Za-z][A-Za-z\s]{1,30})(?:\s+பேசுகிறேன்|$)',
-        t
-    )
+    m = _NAME_TA_RE.search(t)
     if m:
         name = m.group(1).strip().title()
         if len(name) >= 2: return name
 
     # Hindi: "मेरा नाम X है" or "मैं X बोल रहा"
-    m = re.search(
-        r'(?:मेरा\s+नाम\s+|मैं\s+)([A-Za-z][A-Za-z\s]{1,30})(?:\s+है|\s+बोल\s+रहा|$)',
-        t
-    )
+    m = _NAME_HI_RE.search(t)
     if m:
         name = m.group(1).strip().title()
         if len(name) >= 2: return name
 
     if awaiting:
-        if re.match(r'^[A-Za-z]+(?:\s+[A-Za-z]+)?$', t) and 2 <= len(t) <= 40:
+        if _NAME_PLAIN_RE.match(t) and 2 <= len(t) <= 40:
             _EXCLUDE = {
                 'yes','no', 'new', 'old', 'book', 'cancel', 'reschedule', 'appointment',
                 'patient', 'existing', 'hello', 'hi', 'hey', 'okay', 'ok', 'sure', 'thanks',
@@ -264,7 +442,7 @@ def fast_extract_name(text, awaiting=False):
 
 
 def fast_extract_phone(text):
-    digits = re.sub(r'[^\d]', '', text)
+    digits = text.translate(_DIGITS_ONLY)
     if len(digits) == 10: return digits
     if len(digits) == 12 and digits.startswith('91'): return digits[2:]
     if len(digits) == 11 and digits.startswith('0'):  return digits[1:]
@@ -275,36 +453,27 @@ def fast_extract_date(text):
     t = text.lower().strip()
     today = datetime.now(get_tz())
 
-    if re.search(r'\btoday\b', t):
+    if _DATE_TODAY_RE.search(t):
         return today.strftime("%Y-%m-%d")
-    if re.search(r'\b(tomorrow|tommorow|tommorrow|tomorow)\b', t):
-        return (today + timedelta(days=1)).strftime("%Y-%m-%d")
-    if re.search(r'\bday\s+after\s+(tomorrow|tommorow|tommorrow|tomorow)\b', t):
+    if _DATE_DAY_AFTER_RE.search(t):
         return (today + timedelta(days=2)).strftime("%Y-%m-%d")
+    if _DATE_TOMORROW_RE.search(t):
+        return (today + timedelta(days=1)).strftime("%Y-%m-%d")
 
-    m = re.search(r'\b(\d{1,2})[\/\-](\d{1,2})[\/\-](\d{2,4})\b', t)
+    m = _DATE_DMY_RE.search(t)
     if m:
         d, mo, y = m.group(1), m.group(2), m.group(3)
         if len(y) == 2: y = "20" + y
         try: return datetime(int(y), int(mo), int(d)).strftime("%Y-%m-%d")
         except: pass
 
-    m = re.search(r'\b(\d{4})-(\d{2})-(\d{2})\b', t)
+    m = _DATE_ISO_RE.search(t)
     if m: return m.group()
 
-    _MONTHS = {
-        'jan':1,'feb':2,'mar':3,'apr':4,'may':5,'jun':6,
-        'jul':7,'aug':8,'sep':9,'oct':10,'nov':11,'dec':12,
-        'january':1,'february':2,'march':3,'april':4,'june':6,
-        'july':7,'august':8,'september':9,'october':10,'november':11,'december':12,
-    }
     # Pattern 1: Day Month
-    m = re.search(
-        r'\b(\d{1,2})(?:\s*(?:st|nd|rd|th))?\s*(?:of|the|tha)?\s*(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*',
-        t, re.IGNORECASE
-    )
+    m = _DATE_DAY_MONTH_RE.search(t)
     if m:
-        day = int(m.group(1)); mon_str = m.group(2).lower()[:3]; mon = _MONTHS[mon_str]
+        day = int(m.group(1)); mon_str = m.group('mon').lower()[:3]; mon = _MONTHS[mon_str]
         yr = today.year
         try:
             base = datetime(yr, mon, day, tzinfo=get_tz())
@@ -313,12 +482,9 @@ def fast_extract_date(text):
         except: pass
 
     # Pattern 2: Month Day
-    m = re.search(
-        r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*\s*(?:the|tha)?\s*(\d{1,2})(?:\s*(?:st|nd|rd|th))?\b',
-        t, re.IGNORECASE
-    )
+    m = _DATE_MONTH_DAY_RE.search(t)
     if m:
-        mon_str = m.group(1).lower()[:3]; mon = _MONTHS[mon_str]; day = int(m.group(2))
+        mon_str = m.group('mon').lower()[:3]; mon = _MONTHS[mon_str]; day = int(m.group(2))
         yr = today.year
         try:
             base = datetime(yr, mon, day, tzinfo=get_tz())
@@ -327,17 +493,13 @@ def fast_extract_date(text):
         except: pass
 
     # Pattern 3: Weekdays (e.g., Monday, Next Friday)
-    _WEEKDAYS = {
-        'monday':0, 'tuesday':1, 'wednesday':2, 'thursday':3, 'friday':4, 'saturday':5, 'sunday':6, 
-        'mon':0, 'tue':1, 'wed':2, 'thu':3, 'fri':4, 'sat':5, 'sun':6
-    }
-    m = re.search(r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday|mon|tue|wed|thu|fri|sat|sun)\b', t, re.IGNORECASE)
+    m = _DATE_WEEKDAY_RE.search(t)
     if m:
-        target_wd = _WEEKDAYS[m.group(1).lower()]
+        target_wd = _WEEKDAYS[m.group(2).lower()]
         days_ahead = target_wd - today.weekday()
         if days_ahead < 0:  # If the day has passed this week, advance to next week
             days_ahead += 7
-        if re.search(r'\bnext\s+' + m.group(1).lower() + r'\b', t, re.IGNORECASE):
+        if m.group('next'):
             if days_ahead == 0: days_ahead = 7 # "next Monday" on a Monday = next week
             else: days_ahead += 7
         return (today + timedelta(days=days_ahead)).strftime("%Y-%m-%d")
@@ -347,17 +509,17 @@ def fast_extract_date(text):
 
 def fast_extract_time(text):
     t = text.strip()
-    t = re.sub(r'\b([ap])\.?m\.?\b', r'\1m', t, flags=re.IGNORECASE)
-    t_clean = re.sub(r'\b(at|on|for|the|in)\b', ' ', t, flags=re.IGNORECASE).strip()
+    t = _TIME_AMPM_NORM_RE.sub(r'\1m', t)
+    t_clean = _TIME_FILLER_RE.sub(' ', t).strip()
     tu = t_clean.upper()
 
-    m = re.search(r'\b(\d{1,2}):(\d{2})\s*([AP]M)\b', tu)
+    m = _TIME_RE_12H.search(tu)
     if m: return f"{m.group(1)}:{m.group(2)} {m.group(3)}"
-    m = re.search(r'\b(\d{1,2})\s*([AP]M)\b', tu)
+    m = _TIME_RE_HOUR_AMPM.search(tu)
     if m: return f"{m.group(1)}:00 {m.group(2)}"
 
     tl = t_clean.lower()
-    m = re.search(r'\b(\d{1,2})(?::(\d{2}))?\s*(?:in\s+the\s+)?(morning|afternoon|evening|night)\b', tl)
+    m = _TIME_PERIOD_RE.search(tl)
     if m:
         h = int(m.group(1)); mn = m.group(2) or '00'; period = m.group(3)
         if period in ('afternoon','evening') and h < 12: h += 12
@@ -365,7 +527,7 @@ def fast_extract_time(text):
         s = 'PM' if h >= 12 else 'AM'; h12 = h if h <= 12 else h - 12
         if h12 == 0: h12 = 12
         return f"{h12}:{mn} {s}"
-    m = re.search(r'\b(\d{1,2}):(\d{2})\b', t)
+    m = _TIME_RE_24H.search(t)
     if m:
         h = int(m.group(1)); mn = m.group(2)
         s = 'PM' if h >= 12 else 'AM'; h12 = h if h <= 12 else h - 12
@@ -379,28 +541,9 @@ def fast_extract_reason(text):
     t = text.lower().strip()
     
     # Remove phrases commonly used before/after a reason
-    fillers = [
-        r'\bmy\s+name\s+is\b',
-        r'\bi\s+am\s+called\b',
-        r'\bi\s+am\b',
-        r'\bthis\s+is\b',
-        r'\bi\s+is\b',
-        r'\bi\s+(have|need|want|got)\s+(a|an)?\b',
-        r'\bi\s+(need|want)\s+to\s+(book|schedule|see)\b',
-        r'\bappointment\s+for\b',
-        r'\breason\s+is\b',
-        r'\bfor\s+my\b',
-        r'\bi\s+am\s+having\b',
-        r'\bplease\b',
-        r'\btoday\b',
-        r'\btomorrow\b',
-        r'\bhere\b',
-        r'\bkindly\b'
-    ]
-    
     clean = t
-    for p in fillers:
-        clean = re.sub(p, '', clean, flags=re.IGNORECASE).strip()
+    for p in _REASON_FILLER_RES:
+        clean = p.sub('', clean).strip()
     
     # Remove leading/trailing common stop words
     stop_words = {"a", "an", "the", "is", "to", "for", "with", "on", "at", "my"}
@@ -416,33 +559,10 @@ def fast_extract_reason(text):
 
 def fast_yes_no(text):
     t = text.lower().strip()
-    if re.search(
-        r'\b(yes|yeah|yep|yup|yea|ya|correct|confirm|confirmed|confirming|ok|okay|'
-        r'sure|go\s+ahead|proceed|sounds\s+good|right|perfect|'
-        r'looks\s+good|book\s+it|book\s+the\s+appointment|do\s+it|fine|'
-        r'absolutely|definitely|please|just\s+do\s+it|that\s+is\s+it)\b', t
-    ):
-        return 'yes'
-    # Tamil yes
-    if re.search(r'(ஆம்|சரி|ஓகே|சரிதான்|ஆமாம்)', text):
-        return 'yes'
-    # Hindi yes
-    if re.search(r'(हाँ|हां|ठीक\s*है|बिल्कुल|हाँ\s*जी)', text):
+    if _YES_RE.search(t) or any(p.search(text) for p in _YES_ML_RES):
         return 'yes'
-
-    if re.search(
-        r'\b(no|nope|nah|naa|wrong|change|edit|different|incorrect|'
-        r'not\s+right|modify|update|fix|cancel\s+that|wait|none|'
-        r'something\s+else|different\s+time|other|other\s+times?)\b', t
-    ):
-        return 'no'
-    # Tamil no
-    if re.search(r'(வேண்டாம்|வேண்டா|இல்லை)', text):
-        return 'no'
-    # Hindi no
-    if re.search(r'(नहीं|नही|मत)', text):
+    if _NO_RE.search(t) or any(p.search(text) for p in _NO_ML_RES):
         return 'no'
-
     return None
 
 
@@ -453,50 +573,221 @@ class VoiceInterface:
     def __init__(self, use_voice=True):
         self.use_voice = use_voice and (AUDIO_BACKEND is not None) and TTS_AVAILABLE
         if self.use_voice:
+            _import_voice_backends()
+            # TTS runs on a dedicated worker thread: speak() returns as soon as
+            # the text is queued, so the caller can prepare the next listen()
+            # while the utterance is still playing. _tts_done is set whenever
+            # the queue drains — listen() waits on it because the microphone
+            # shares the audio device with playback. The worker owns the
+            # pyttsx3 engine: SAPI5/NSSpeech drivers are thread-affine, so the
+            # engine is initialized once on the thread that drives it.
+            self.engine     = None
+            self._tts_queue = queue.Queue()
+            self._tts_dead  = False   # set if the engine never comes up
+            self._tts_done  = threading.Event()
+            self._tts_done.set()
+            threading.Thread(target=self._tts_worker, daemon=True).start()
+            # Reusable capture buffer — allocated once instead of per turn.
+            # Sized to the VAD hard cap, not DURATION: endpointed capture
+            # treats a full buffer as end-of-utterance, so anything shorter
+            # would truncate long multi-field answers mid-word. The fixed-
+            # window fallback records into a DURATION-length view of it.
+            self._rec_buf = np.empty(
+                (self._MAX_RECORD_SECONDS * SAMPLE_RATE, 1), dtype=np.int16)
+            self._vosk    = None   # lazy: True/False once probed
+            if SPEECH_RECOGNITION_AVAILABLE:
+                self.recognizer = sr.Recognizer()
+        else:
+            logger.warning("running_in_text_mode")
+
+    def _tts_worker(self):
+        try:
             self.engine = pyttsx3.init()
             voices = self.engine.getProperty('voices')
             if len(voices) > 0:
                 self.engine.setProperty('voice', voices[0].id)
             self.engine.setProperty('rate', 100)
             self.engine.setProperty('volume', 1.0)
-            if SPEECH_RECOGNITION_AVAILABLE:
-                self.recognizer = sr.Recognizer()
-        else:
-            logger.warning("running_in_text_mode")
-
-    def speak(self, text):
-        logger.info("agent_speak", text=text)
-        if self.use_voice and TTS_AVAILABLE:
+        except Exception as e:
+            logger.error("tts_engine_init_failed", error=str(e))
+            # Engine never came up: mark TTS dead so speak() stops
+            # clearing _tts_done, and keep draining the queue with the
+            # event re-set — a speak() racing the flag can otherwise
+            # strand listen()/speak_and_wait() on the event forever.
+            self._tts_dead = True
+            self._tts_done.set()
+            while True:
+                self._tts_queue.get()
+                self._tts_queue.task_done()
+                self._tts_done.set()
+        while True:
+            text = self._tts_queue.get()
             try:
-                tts_text = text.replace("*", "").replace("\n", ". ")
-                self.engine.say(tts_text)
+                self.engine.say(text)
                 self.engine.runAndWait()
             except Exception as e:
                 logger.error("tts_error", error=str(e))
+            finally:
+                if self._tts_queue.empty():
+                    self._tts_done.set()
+                self._tts_queue.task_done()
+
+    def speak(self, text):
+        logger.info("agent_speak", text=text)
+        if self.use_voice and TTS_AVAILABLE and not self._tts_dead:
+            tts_text = text.replace("*", "").replace("\n", ". ")
+            self._tts_done.clear()
+            self._tts_queue.put(tts_text)
+
+    def speak_and_wait(self, text):
+        """speak(), then block until playback drains — for synchronization
+        points like the goodbye message right before the process exits."""
+        self.speak(text)
+        if self.use_voice and TTS_AVAILABLE:
+            self._tts_done.wait()
+
+    #  VAD endpointing parameters (20 ms frames, webrtcvad-compatible)
+    _FRAME_MS            = 20
+    _FRAME_SAMPLES       = SAMPLE_RATE * _FRAME_MS // 1000
+    _MIN_SPEECH_MS       = 300    # must hear this much speech before endpointing
+    _TRAILING_SILENCE_MS = 500    # stop this long after the speaker goes quiet
+    _ENERGY_THRESHOLD    = 500    # mean |int16| above this counts as speech (no-VAD fallback)
+    _MAX_RECORD_SECONDS  = 10     # hard cap so a noisy room can't record forever
 
     def record_audio_sounddevice(self, duration=DURATION):
+        try:
+            return self._record_vad_endpointed()
+        except Exception as e:
+            logger.warning("endpointed_recording_failed_fallback_fixed", error=str(e))
         try:
             logger.info("recording_started", duration=duration)
-            audio_data = sd.rec(int(duration * SAMPLE_RATE), samplerate=SAMPLE_RATE, channels=1, dtype=np.int16)
+            n_samples = int(duration * SAMPLE_RATE)
+            if n_samples <= self._rec_buf.shape[0]:
+                # Record in place into a view of the persistent buffer
+                audio_data = sd.rec(out=self._rec_buf[:n_samples], samplerate=SAMPLE_RATE)
+            else:
+                audio_data = sd.rec(n_samples, samplerate=SAMPLE_RATE, channels=1, dtype=np.int16)
             sd.wait()
             return audio_data
         except Exception as e:
             logger.error("recording_error", error=str(e)); return None
 
+    def _record_vad_endpointed(self, on_frame=None):
+        """Stream 20 ms frames and return as soon as the speaker has been
+        quiet for _TRAILING_SILENCE_MS — a short 'yes' costs ~1 s of capture
+        instead of the full fixed window. Speech detection uses webrtcvad
+        when installed and a cheap mean-energy threshold otherwise.
+
+        on_frame, when given, receives each raw frame as it arrives — used to
+        feed a streaming recognizer during capture. When it returns truthy
+        the recognizer has endpointed the utterance itself and capture stops
+        immediately (the streaming equivalent of single_utterance=True)."""
+        logger.info("recording_started_vad")
+        vad = webrtcvad.Vad(3) if VAD_AVAILABLE else None
+        q   = queue.Queue()
+
+        def _cb(indata, frame_count, time_info, status):
+            q.put(bytes(indata))
+
+        # Frames land directly in the persistent capture buffer — no
+        # per-utterance list of byte chunks plus a join/copy at the end.
+        buf      = self._rec_buf
+        capacity = buf.shape[0]
+        written  = 0
+
+        speech_ms  = 0
+        silence_ms = 0
+        deadline   = time.time() + self._MAX_RECORD_SECONDS
+        with sd.RawInputStream(samplerate=SAMPLE_RATE, blocksize=self._FRAME_SAMPLES,
+                               channels=1, dtype='int16', callback=_cb):
+            while time.time() < deadline:
+                try:
+                    frame = q.get(timeout=1)
+                except queue.Empty:
+                    continue
+                samples = np.frombuffer(frame, dtype=np.int16)
+                n = samples.shape[0]
+                if written + n > capacity:
+                    break   # buffer full — treat as end of utterance
+                buf[written:written + n, 0] = samples
+                written += n
+                if on_frame is not None and on_frame(frame) and speech_ms >= self._MIN_SPEECH_MS:
+                    break
+                if vad is not None:
+                    is_speech = vad.is_speech(frame, SAMPLE_RATE)
+                else:
+                    is_speech = np.abs(samples).mean() > self._ENERGY_THRESHOLD
+                if is_speech:
+                    speech_ms += self._FRAME_MS
+                    silence_ms = 0
+                else:
+                    silence_ms += self._FRAME_MS
+                    if speech_ms >= self._MIN_SPEECH_MS and silence_ms >= self._TRAILING_SILENCE_MS:
+                        break
+
+        if written == 0:
+            return None
+        return buf[:written]
+
+    def _get_vosk(self):
+        """Lazily build a Vosk streaming recognizer (offline ASR).
+        Returns a fresh KaldiRecognizer, or None when the model can't load."""
+        if self._vosk is False:
+            return None
+        if self._vosk is None:
+            try:
+                from vosk import Model, KaldiRecognizer
+                model_path = os.getenv("VOSK_MODEL_PATH", "vosk-model-small-en-us-0.15")
+                self._vosk_model       = Model(model_path)
+                self._KaldiRecognizer  = KaldiRecognizer
+                self._vosk = True
+            except Exception as e:
+                logger.warning("vosk_unavailable_fallback_batch_asr", error=str(e))
+                self._vosk = False
+                return None
+        return self._KaldiRecognizer(self._vosk_model, SAMPLE_RATE)
+
+    def _listen_streaming(self):
+        """Streaming ASR: feed frames to Vosk while recording, so the final
+        transcript is ready at end of utterance instead of after a batch
+        HTTPS upload to recognize_google. Returns None to fall back to the
+        batch path when Vosk can't run."""
+        rec = self._get_vosk()
+        if rec is None:
+            return None
+        try:
+            audio = self._record_vad_endpointed(on_frame=rec.AcceptWaveform)
+        except Exception as e:
+            logger.warning("streaming_asr_error", error=str(e))
+            return None
+        if audio is None:
+            return "unknown"
+        text = (_fast_json or json).loads(rec.FinalResult()).get("text", "").strip()
+        if not text:
+            return "unknown"
+        logger.info("patient_speak", text=text)
+        return text
+
     def audio_to_text_sounddevice(self, audio_data):
         if not SPEECH_RECOGNITION_AVAILABLE: return "error"
         try:
-            buf = io.BytesIO()
-            wavfile.write(buf, SAMPLE_RATE, audio_data); buf.seek(0)
-            with sr.AudioFile(buf) as src:
-                audio = self.recognizer.record(src)
-                text  = self.recognizer.recognize_google(audio)
-                logger.info("patient_speak", text=text); return text
+            # Wrap the raw PCM directly — serializing to an in-memory WAV
+            # just so AudioFile can parse the same bytes back out costs two
+            # full copies plus header parsing per utterance.
+            pcm   = np.ascontiguousarray(audio_data).tobytes()
+            audio = sr.AudioData(pcm, SAMPLE_RATE, audio_data.dtype.itemsize)
+            text  = self.recognizer.recognize_google(audio)
+            logger.info("patient_speak", text=text); return text
         except sr.UnknownValueError: return "unknown"
         except Exception as e: logger.error("recognition_error", error=str(e)); return "error"
 
     def listen(self):
         if self.use_voice and AUDIO_BACKEND == "sounddevice":
+            self._tts_done.wait()   # exclusive audio device — let playback finish
+            if VOSK_AVAILABLE:
+                text = self._listen_streaming()
+                if text is not None:
+                    return text
             try:
                 audio_data = self.record_audio_sounddevice()
                 return self.audio_to_text_sounddevice(audio_data) if audio_data is not None else "error"
@@ -517,29 +808,61 @@ class GoogleCalendarManager:
             cls._instance._initialized = False
         return cls._instance
 
+    #  Cached day intervals go stale if another writer books the same day,
+    #  so entries expire after this many seconds even without local writes.
+    _DAY_CACHE_TTL = 60
+
+    #  Pulls the phone digits out of the event description we write in
+    #  create_appointment ("Phone: <number>").
+    _DESC_PHONE_RE = re.compile(r'Phone:\s*([0-9\-\s]+)')
+
     def __init__(self):
         if getattr(self, '_initialized', False):
             return
         self.service = self._authenticate()
+        # date str -> (fetched_at, intervals, phone_index, unindexed_events)
+        #   intervals:   [(start_ts, end_ts, description), ...]
+        #   phone_index: normalized phone digits -> [event, ...]
+        #   unindexed:   events whose description has no parsable phone line
+        self._day_cache = {}
         self._initialized = True
 
     def _authenticate(self):
+        # Local imports: the Google client stack is only needed once, here,
+        # and keeping it off the module path speeds cold start.
+        import httplib2
+        import google_auth_httplib2
+        from googleapiclient.discovery import build
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport.requests import Request
+        from google.auth.exceptions import RefreshError
+        from google.oauth2.credentials import Credentials
+
         creds = None
-        if os.path.exists("token.pickle"):
+        if os.path.exists("token.json"):
             try:
-                with open("token.pickle", "rb") as f:
-                    creds = pickle.load(f)
-            except (TypeError, pickle.UnpicklingError, EOFError) as e:
-                logger.error("corrupt_token_pickle_detected_calendar", error=str(e))
+                creds = Credentials.from_authorized_user_file("token.json", SCOPES)
+            except Exception as e:
+                logger.error("corrupt_token_json_detected_calendar", error=str(e))
                 try:
                     # Don't delete here if SheetsManager already might have, but safe to try
-                    if os.path.exists("token.pickle"):
-                        os.remove("token.pickle")
-                        logger.info("deleted_corrupt_token_pickle_calendar")
+                    if os.path.exists("token.json"):
+                        os.remove("token.json")
+                        logger.info("deleted_corrupt_token_json_calendar")
                 except:
                     pass
+        elif os.path.exists("token.pickle"):
+            # Legacy pickle store — load once and convert to the JSON form
+            # (the pickle stays for the automation scripts that read it).
+            try:
+                import pickle
+                with open("token.pickle", "rb") as f:
+                    creds = pickle.load(f)
+                with open("token.json", "w") as f:
+                    f.write(creds.to_json())
+                logger.info("token_migrated_to_json")
             except Exception as e:
-                logger.error("unexpected_token_load_error_calendar", error=str(e))
+                logger.error("token_pickle_migration_failed", error=str(e))
 
         if not creds or not (hasattr(creds, 'valid') and creds.valid):
             if creds and creds.expired and creds.refresh_token:
@@ -550,8 +873,8 @@ class GoogleCalendarManager:
                     except RefreshError as e:
                         logger.warning("token_refresh_error_invalid_grant", error=str(e))
                         creds = None # Trigger Flow
-                        if os.path.exists("token.pickle"):
-                            try: os.remove("token.pickle")
+                        if os.path.exists("token.json"):
+                            try: os.remove("token.json")
                             except: pass
                         break
                     except Exception as e:
@@ -561,61 +884,185 @@ class GoogleCalendarManager:
             if not creds or not (hasattr(creds, 'valid') and creds.valid):
                 flow  = InstalledAppFlow.from_client_secrets_file("credentials.json", SCOPES)
                 creds = flow.run_local_server(port=0)
-                with open("token.pickle", "wb") as f:
-                    pickle.dump(creds, f)
-        return build("calendar", "v3", credentials=creds)
-
-    def is_available(self, start_dt, end_dt, customer_id=None):
+                with open("token.json", "w") as f:
+                    f.write(creds.to_json())
+        # One explicit AuthorizedHttp for the life of the manager: every
+        # calendar call reuses its kept-alive TLS connection instead of
+        # re-handshaking, and the timeout bounds a stalled round-trip so a
+        # hung API call can't freeze a voice turn indefinitely.
+        authed_http = google_auth_httplib2.AuthorizedHttp(
+            creds, http=httplib2.Http(timeout=10))
+        # static_discovery pins the service definition to the copy bundled
+        # with the client library — no discovery fetch/parse at cold start.
+        return build("calendar", "v3", http=authed_http,
+                     cache_discovery=False, static_discovery=True)
+
+    def prefetch_day(self, date_str):
+        """Fetch every event for a day in ONE events().list call and cache
+        the busy intervals. Repeated availability probes for nearby slots
+        (the common case after 'that slot is taken') then resolve locally
+        instead of each paying an HTTPS round-trip."""
+        # date_str is always extractor-normalized "YYYY-MM-DD" — slice it
+        # directly instead of paying the strptime format interpreter.
+        day_start = datetime(int(date_str[0:4]), int(date_str[5:7]),
+                             int(date_str[8:10]), tzinfo=get_tz())
+        day_end   = day_start + timedelta(days=1)
+        # fields mask: the day cache only ever reads these attributes
+        # (intervals, the phone index, and the id/summary callers act
+        # on) — attendees, conference data, reminders etc. stay server-
+        # side, shrinking the response body and its JSON parse.
         res = self.service.events().list(
-            calendarId="primary", timeMin=start_dt.isoformat(),
-            timeMax=end_dt.isoformat(), singleEvents=True,
+            calendarId="primary", timeMin=day_start.isoformat(),
+            timeMax=day_end.isoformat(), singleEvents=True,
+            fields="items(id,summary,description,start,end,extendedProperties/private)",
         ).execute()
-        items = res.get("items", [])
-        if not items:
+        phone_index = {}
+        unindexed   = []
+        intervals = []
+        for e in res.get("items", []):
+            desc = e.get("description", "")
+            key  = e.get("extendedProperties", {}).get("private", {}).get("phone")
+            if not key:
+                # Older events predate the structured property — parse the
+                # description once here rather than on every lookup.
+                m = self._DESC_PHONE_RE.search(desc)
+                if m: key = m.group(1).translate(_DIGITS_ONLY)
+            if key:
+                phone_index.setdefault(key, []).append(e)
+            else:
+                unindexed.append(e)
+            s = e.get("start", {}).get("dateTime")
+            t = e.get("end", {}).get("dateTime")
+            if not s or not t:
+                continue
+            intervals.append((
+                datetime.fromisoformat(s).timestamp(),
+                datetime.fromisoformat(t).timestamp(),
+                desc,
+            ))
+        intervals.sort()   # sorted by start so probes can bisect
+        self._day_cache[date_str] = (time.time(), intervals, phone_index, unindexed)
+        return intervals
+
+    def is_available(self, start_dt, end_dt, customer_id=None):
+        date_key = start_dt.strftime("%Y-%m-%d")
+        cached = self._day_cache.get(date_key)
+        if cached and time.time() - cached[0] < self._DAY_CACHE_TTL:
+            intervals = cached[1]
+        else:
+            intervals = self.prefetch_day(date_key)
+
+        s_ts, e_ts = start_dt.timestamp(), end_dt.timestamp()
+        # Intervals are start-sorted: everything at or past the probe's end
+        # can't overlap, so cut the scan off there.
+        hi = bisect_left(intervals, (e_ts,))
+        overlapping = [desc for c_start, c_end, desc in intervals[:hi]
+                       if c_end > s_ts]
+        if not overlapping:
             return True
-        
+
         # Self-bypass logic: if ALL matching events belong to this customer, return True
         if customer_id:
-            for e in items:
-                desc = e.get("description", "")
-                if f"Customer ID: {customer_id}" not in desc:
-                    return False
-            return True
-            
-        return len(items) == 0
+            return all(f"Customer ID: {customer_id}" in desc for desc in overlapping)
 
-    def create_appointment(self, name, phone, start_dt, reason, customer_id=None):
-        end_dt = start_dt + timedelta(minutes=APPOINTMENT_DURATION_MIN)
-        if not self.is_available(start_dt, end_dt, customer_id=customer_id): return None
+        return False
+
+    def _event_body(self, name, phone, start_dt, end_dt, reason, customer_id=None):
         desc = f"Patient: {name}\nPhone: {phone}\nReason: {reason}"
         if customer_id: desc = f"Customer ID: {customer_id}\n" + desc
-        event = {
+        private = {"phone": str(phone).translate(_DIGITS_ONLY)}
+        if customer_id:
+            private["customer_id"] = customer_id
+        return {
             "summary":     f"Dental - {name}",
             "description": desc,
+            # Structured copy of the lookup keys — prefetch_day indexes these
+            # without re-parsing the human-readable description.
+            "extendedProperties": {"private": private},
             "start": {"dateTime": start_dt.isoformat(), "timeZone": TIMEZONE},
             "end":   {"dateTime": end_dt.isoformat(),   "timeZone": TIMEZONE},
         }
+
+    def create_appointment(self, name, phone, start_dt, reason, customer_id=None, skip_availability_check=False):
+        end_dt = start_dt + timedelta(minutes=APPOINTMENT_DURATION_MIN)
+        # skip_availability_check=True means the caller already resolved the
+        # slot (e.g. via the speculative prefetch) — saves one events().list RPC.
+        if not skip_availability_check and not self.is_available(start_dt, end_dt, customer_id=customer_id): return None
+        event = self._event_body(name, phone, start_dt, end_dt, reason, customer_id)
         created = self.service.events().insert(calendarId="primary", body=event).execute()
+        self._day_cache.pop(start_dt.strftime("%Y-%m-%d"), None)
         return created["id"]
 
+    def batch_reschedule(self, old_event, name, phone, new_start, reason, customer_id=None):
+        """Cancel the old event and insert the replacement in ONE batched HTTP
+        request (multipart POST to the Calendar batch endpoint) instead of two
+        sequential round-trips. Returns the new event id, or None if the slot
+        is taken or the insert failed — in which case the original appointment
+        is left (or restored) on the calendar."""
+        new_end = new_start + timedelta(minutes=APPOINTMENT_DURATION_MIN)
+        if not self.is_available(new_start, new_end, customer_id=customer_id):
+            return None
+        event = self._event_body(name, phone, new_start, new_end, reason, customer_id)
+
+        old_id = (old_event or {}).get("id")
+        if not old_id or old_id == "SHEETS_ONLY":
+            # Nothing to delete on the calendar side — plain insert.
+            created = self.service.events().insert(calendarId="primary", body=event).execute()
+            self._day_cache.clear()
+            return created["id"]
+
+        results = {}
+        def _cb(request_id, response, exception):
+            results[request_id] = (response, exception)
+        batch = self.service.new_batch_http_request(callback=_cb)
+        batch.add(self.service.events().delete(calendarId="primary", eventId=old_id), request_id="del")
+        batch.add(self.service.events().insert(calendarId="primary", body=event), request_id="ins")
+        batch.execute()
+        self._day_cache.clear()
+
+        ins_resp, ins_exc = results.get("ins", (None, None))
+        del_resp, del_exc = results.get("del", (None, None))
+        if ins_exc is not None:
+            logger.error("batch_reschedule_insert_failed", error=str(ins_exc))
+            if del_exc is None:
+                # Old slot was freed but the insert lost a race — restore it.
+                restore = {k: old_event[k] for k in
+                           ("summary", "description", "start", "end", "extendedProperties")
+                           if k in old_event}
+                try:
+                    self.service.events().insert(calendarId="primary", body=restore).execute()
+                except Exception:
+                    logger.error("batch_reschedule_rollback_failed", event_id=old_id)
+            return None
+        if del_exc is not None:
+            # New event landed but the old one survived — retry the delete
+            # directly so the patient doesn't end up double-booked.
+            logger.warning("batch_reschedule_delete_failed_retrying", error=str(del_exc))
+            try:
+                self.service.events().delete(calendarId="primary", eventId=old_id).execute()
+            except Exception:
+                logger.error("batch_reschedule_delete_retry_failed", event_id=old_id)
+        return ins_resp["id"]
+
     def find_appointment(self, name, phone, date, time_str=None):
-        start  = datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=get_tz())
-        end    = start + timedelta(days=1)
-        # We fetch all events for the day and manually filter to ensure strict phone matching
-        events = self.service.events().list(
-            calendarId="primary", timeMin=start.isoformat(),
-            timeMax=end.isoformat(), singleEvents=True
-        ).execute().get("items", [])
-        
-        search_phone = str(phone).strip()
+        # Resolve from the day cache (shared with is_available) — the phone
+        # index is built once per fetch, so lookup is a dict probe instead of
+        # a per-event description scan.
+        cached = self._day_cache.get(date)
+        if not (cached and time.time() - cached[0] < self._DAY_CACHE_TTL):
+            self.prefetch_day(date)
+            cached = self._day_cache[date]
+        _, _, phone_index, unindexed = cached
+
+        # Single-pass digit normalization — tolerates "98765-43210" style input
+        search_phone = str(phone).translate(_DIGITS_ONLY) or str(phone).strip()
         target_time = None
         if time_str:
             try:
                 # Use simple normalization
                 t = str(time_str).strip().upper().replace(" ", "")
                 if ":" not in t:
-                    import re
-                    m = re.match(r"(\d+)(AM|PM)", t)
+                    m = _HOUR_AMPM_RE.match(t)
                     if m: t = f"{m.group(1)}:00{m.group(2)}"
                 # Convert to standard format
                 dt = datetime.strptime(t, "%I:%M%p" if "AM" in t or "PM" in t else "%H:%M")
@@ -623,19 +1070,23 @@ class GoogleCalendarManager:
             except:
                 target_time = time_str.strip().upper()
 
-        for e in events:
-            desc = e.get("description", "")
-            # Match strictly on phone number to avoid "ghost" matches from similar names
-            if search_phone in desc:
-                if target_time:
-                    # Double check the start time matches
-                    e_start = e.get("start", {}).get("dateTime")
-                    if e_start:
-                        e_dt = datetime.fromisoformat(e_start)
-                        e_time = e_dt.strftime("%I:%M %p").lstrip("0")
-                        if e_time != target_time:
-                            continue
-                return e
+        # Match strictly on phone number to avoid "ghost" matches from similar
+        # names; events without a parsable Phone: line fall back to the old
+        # substring scan.
+        candidates = phone_index.get(search_phone)
+        if not candidates:
+            candidates = [e for e in unindexed
+                          if search_phone in e.get("description", "")]
+        for e in candidates:
+            if target_time:
+                # Double check the start time matches
+                e_start = e.get("start", {}).get("dateTime")
+                if e_start:
+                    e_dt = datetime.fromisoformat(e_start)
+                    e_time = e_dt.strftime("%I:%M %p").lstrip("0")
+                    if e_time != target_time:
+                        continue
+            return e
         return None
 
     def cancel(self, event_id):
@@ -643,12 +1094,27 @@ class GoogleCalendarManager:
             logger.info("skipping_calendar_cancel_sheets_only_or_missing")
             return
         self.service.events().delete(calendarId="primary", eventId=event_id).execute()
+        # Event date isn't known here — drop all cached days
+        self._day_cache.clear()
 
 
 # ─
 #  DENTAL VOICE AGENT
 # ─
 class DentalVoiceAgent:
+    _llm_base_static = None    # static system prompt, built once per process
+    _prefetch_pool_shared = None
+    _prefetch_pool_lock = threading.Lock()
+
+    @classmethod
+    def _shared_prefetch_pool(cls):
+        if cls._prefetch_pool_shared is None:
+            with cls._prefetch_pool_lock:
+                if cls._prefetch_pool_shared is None:
+                    cls._prefetch_pool_shared = ThreadPoolExecutor(
+                        max_workers=4, thread_name_prefix="prefetch")
+        return cls._prefetch_pool_shared
+
     def __init__(self, use_voice=True, streaming=True, calendar=None, sheets=None, vdb=None):
         self.calendar       = calendar or GoogleCalendarManager()
         self.sheets         = sheets   or GoogleSheetsManager()
@@ -663,8 +1129,44 @@ class DentalVoiceAgent:
         self.awaiting_field = None
         self.reset_state()
 
-        # FIX 4 — build the static parts of the LLM system prompt once at init.
-        self._llm_base_system = self._build_base_system()
+        # Intent -> action dispatch table (built once); _execute becomes a
+        # single dict probe instead of a chain of string comparisons.
+        self._intent_handlers = {
+            "book":              self._book,
+            "reschedule":        self._reschedule,
+            "cancel":            self._cancel,
+            "view_appointments": self._view,
+        }
+
+        # Speculative lookups — calendar availability is submitted as soon as
+        # date+time are known so the events().list round-trip overlaps the
+        # remaining turns (reason, confirmation) instead of blocking _book();
+        # the Sheets customer auto-verify overlaps the LLM parse the same way.
+        # One pool for the whole process: web sessions each build an agent,
+        # and per-instance executors would spawn two threads per caller.
+        self._prefetch_pool         = DentalVoiceAgent._shared_prefetch_pool()
+        self._availability_prefetch = None   # (key, submitted_ts, Future) or None
+        self._customer_prefetch     = None   # (phone, Future) or None
+
+        # TTL cache for Sheets customer rows — repeated lookups of the same
+        # ID within a session (confirmation turns, server bridges) hit memory
+        # instead of re-paying the API round-trip.
+        self._customer_cache = {}            # cid -> (fetched_at, record)
+
+        # FIX 4 — the static parts of the LLM system prompt are identical
+        # for every instance, so they are built once per process and shared.
+        if DentalVoiceAgent._llm_base_static is None:
+            DentalVoiceAgent._llm_base_static = self._build_base_system()
+        self._llm_base_system = DentalVoiceAgent._llm_base_static
+        # Rough token count (~4 chars/token) of the static prefix — passed as
+        # num_keep so a context shift never evicts the instruction block.
+        self._llm_num_keep = len(self._llm_base_system) // 4
+
+        # Exact-match LLM parse cache. Common single-phrase turns ("yes",
+        # "tomorrow", "10 AM") parse identically every time — a hit skips the
+        # whole Ollama round-trip. Keyed on (awaiting_field, text, today) so
+        # relative-date answers never leak across days. LRU-evicted.
+        self._llm_cache: OrderedDict[tuple, dict] = OrderedDict()
 
     #  FIX 4: static system prompt fragment (built once, reused every call) 
     def _build_base_system(self):
@@ -737,46 +1239,66 @@ class DentalVoiceAgent:
             logger.error("time_validation_failed", time_str=t_str, error=str(e))
             return True
 
-    #  FIX 4/5: LLM call — injects only dynamic parts into pre-built base 
+    #  Per-field FOCUS hints — built once; {today} is filled in per call
+    _FIELD_HINTS = {
+        "patient_type":  "Is the user new or existing/old patient? Reply new or old.",
+        "customer_id":   "Extract customer ID (format CUST###, e.g. CUST001). User may say just the number like '1' or '001'.",
+        "name":          "Extract the patient's full name.",
+        "phone":         "Extract the 10-digit mobile number (digits only).",
+        "date":          "Extract appointment date as YYYY-MM-DD. Today is {today}. Interpret: tomorrow, next Monday, etc.",
+        "time":          "Extract appointment time as H:MM AM/PM.",
+        "new_date":      "Extract the NEW preferred date for rescheduling as YYYY-MM-DD. Today is {today}.",
+        "new_time":      "Extract the NEW preferred time for rescheduling as H:MM AM/PM.",
+        "reason":        "Extract the reason for the dental visit (e.g. checkup, toothache, cleaning).",
+    }
+
+    #  FIX 4/5: LLM call — static base prompt first, dynamic tail appended
     def _call_llm(self, text, awaiting_field=None, context="", stream=False):
         today_str = datetime.now(get_tz()).strftime("%Y-%m-%d")
 
-        _FIELD_HINTS = {
-            "patient_type":  "Is the user new or existing/old patient? Reply new or old.",
-            "customer_id":   "Extract customer ID (format CUST###, e.g. CUST001). User may say just the number like '1' or '001'.",
-            "name":          "Extract the patient's full name.",
-            "phone":         "Extract the 10-digit mobile number (digits only).",
-            "date":          f"Extract appointment date as YYYY-MM-DD. Today is {today_str}. Interpret: tomorrow, next Monday, etc.",
-            "time":          "Extract appointment time as H:MM AM/PM.",
-            "new_date":      f"Extract the NEW preferred date for rescheduling as YYYY-MM-DD. Today is {today_str}.",
-            "new_time":      "Extract the NEW preferred time for rescheduling as H:MM AM/PM.",
-            "reason":        "Extract the reason for the dental visit (e.g. checkup, toothache, cleaning).",
-        }
+        # Exact-match cache — only for plain (non-stream, no-RAG) parse calls.
+        cache_key = None
+        if not stream and not context:
+            cache_key = (awaiting_field or "", text.strip().lower(), today_str)
+            cached = self._llm_cache.get(cache_key)
+            if cached is not None:
+                self._llm_cache.move_to_end(cache_key)
+                logger.info("llm_cache_hit", awaiting=awaiting_field)
+                return dict(cached)
+
         hint = ""
-        if awaiting_field and awaiting_field in _FIELD_HINTS:
-            hint = f" FOCUS: {_FIELD_HINTS[awaiting_field]}"
-
-        # Compose final system prompt by injecting dynamic parts into the cached base
-        system = (
-            f"Today: {today_str}.{hint}\n"
-            f"KNOWLEDGE BASE CONTEXT (Use this to answer questions):\n{context}\n\n"
-            + self._llm_base_system
-        )
+        if awaiting_field and awaiting_field in self._FIELD_HINTS:
+            hint = f" FOCUS: {self._FIELD_HINTS[awaiting_field].format(today=today_str)}"
+
+        # Compose the system prompt as static prefix + dynamic tail. The
+        # ~1.5 KB base never changes, and keeping it FIRST lets the Ollama
+        # server reuse its KV cache for the shared prefix across turns —
+        # only the short dynamic tail is re-evaluated.
+        system = self._llm_base_system + f"\n\nToday: {today_str}.{hint}\n"
+        if context:
+            system += f"KNOWLEDGE BASE CONTEXT (Use this to answer questions):\n{context}\n"
 
         try:
             _t0 = time.time()
-            resp = requests.post(
+            resp = _OLLAMA_SESSION.post(
                 f"{OLLAMA_BASE_URL}/api/chat",
                 json={
                     "model":      OLLAMA_MODEL,
                     "messages":   [{"role": "system", "content": system},
                                    {"role": "user",   "content": text}],
                     "stream":     stream,
+                    "format":     "json",   # constrained decoding — no markdown fences
                     "keep_alive": -1,
                     "options":    {
                         "num_predict": LLM_NUM_PREDICT,
                         "temperature": 0.1,
+                        "top_p":       0.9,
+                        # format=json already grammar-stops at the closing
+                        # brace; the blank-line stop bounds models that ignore
+                        # the constraint and start a second object.
+                        "stop":        ["\n\n"],
                         "num_ctx":     LLM_NUM_CTX,   # FIX 5 — 1024 prevents prompt truncation
+                        "num_keep":    self._llm_num_keep,
                         "num_gpu":     -1
                     },
                 },
@@ -789,17 +1311,26 @@ class DentalVoiceAgent:
             if stream: return resp
 
             raw = resp.json()["message"]["content"].strip()
-            raw = re.sub(r'<think>.*?</think>', '', raw, flags=re.DOTALL).strip()
-            raw = re.sub(r'```(?:json)?\s*(.*?)\s*```', r'\1', raw, flags=re.DOTALL).strip()
-            match = re.search(r'\{.*\}', raw, re.DOTALL)
-            if not match:
-                logger.warning("llm_no_json_found", raw_response=raw[:200])
+            # format=json gives pure JSON — parse directly (orjson when
+            # available); the fence/think stripping only runs as a fallback
+            # for models that ignore the constraint.
+            try:
+                parsed = (_fast_json or json).loads(raw)
+            except Exception:
+                raw = _THINK_BLOCK_RE.sub('', raw).strip()
+                raw = _CODE_FENCE_RE.sub(r'\1', raw).strip()
+                match = _JSON_OBJECT_RE.search(raw)
+                if not match:
+                    logger.warning("llm_no_json_found", raw_response=raw[:200])
+                    return None
+                parsed = (_fast_json or json).loads(_TRAILING_COMMA_RE.sub(r'\1', match.group()))
+            if not isinstance(parsed, dict):
+                logger.warning("llm_non_object_json", raw_response=raw[:200])
                 return None
-            parsed = json.loads(re.sub(r',\s*([}\]])', r'\1', match.group()))
 
             # Normalise phone
             if parsed.get("phone"):
-                digits = re.sub(r'[^\d]', '', str(parsed["phone"]))
+                digits = str(parsed["phone"]).translate(_DIGITS_ONLY)
                 if len(digits) == 12 and digits.startswith('91'): digits = digits[2:]
                 if len(digits) == 11 and digits.startswith('0'):  digits = digits[1:]
                 parsed["phone"] = digits if len(digits) == 10 else ""
@@ -826,6 +1357,10 @@ class DentalVoiceAgent:
                 parsed["reason"] = fast_extract_reason(str(parsed["reason"])) or parsed["reason"]
 
             logger.info("llm_inference_result", latency_ms=_latency_ms, extracted=parsed)
+            if cache_key is not None:
+                self._llm_cache[cache_key] = dict(parsed)
+                if len(self._llm_cache) > LLM_CACHE_MAX:
+                    self._llm_cache.popitem(last=False)
             return parsed
         except requests.exceptions.Timeout:
             logger.error("llm_timeout")
@@ -860,7 +1395,7 @@ class DentalVoiceAgent:
                 # Auto-verify customer for existing patients when phone is provided
                 if k == "phone" and self.state.get("patient_type") == "old":
                     if not self.state.get("customer_confirmed"):
-                        c = self.sheets.get_customer_by_phone(v)
+                        c = self._lookup_customer_by_phone(v)
                         if c:
                             self.state.update({
                                 "name": c["name"],
@@ -908,36 +1443,144 @@ class DentalVoiceAgent:
                         s["date"] = None
                         s["time"] = None
 
+        self._maybe_prefetch_availability()
+
+    def _maybe_prefetch_customer(self, phone):
+        """Kick off the Sheets customer lookup in the background as soon as the
+        fast extractor sees a phone for an unverified old patient, so the API
+        round-trip runs under the LLM parse instead of after it."""
+        s = self.state
+        if not phone or s.get("patient_type") != "old" or s.get("customer_confirmed"):
+            return
+        if self._customer_prefetch and self._customer_prefetch[0] == phone:
+            return   # already in flight for this phone
+        fut = self._prefetch_pool.submit(self.sheets.get_customer_by_phone, phone)
+        self._customer_prefetch = (phone, fut)
+
+    #  Customer rows change rarely; a short TTL keeps them fresh enough
+    _CUSTOMER_CACHE_TTL = 300
+
+    def _get_customer_cached(self, customer_id):
+        """Sheets customer lookup with a small TTL cache. Only found records
+        are cached, so a just-registered ID resolves on the next try."""
+        hit = self._customer_cache.get(customer_id)
+        if hit and time.time() - hit[0] < self._CUSTOMER_CACHE_TTL:
+            return hit[1]
+        customer = self.sheets.get_customer_by_id(customer_id)
+        if customer:
+            self._customer_cache[customer_id] = (time.time(), customer)
+        return customer
+
+    def _lookup_customer_by_phone(self, phone):
+        """Consume the speculative lookup when it matches, else query now."""
+        pre, self._customer_prefetch = self._customer_prefetch, None
+        if pre and pre[0] == phone:
+            try:
+                return pre[1].result()
+            except Exception as e:
+                logger.warning("customer_prefetch_failed", error=str(e))
+        return self.sheets.get_customer_by_phone(phone)
+
+    def _maybe_prefetch_availability(self):
+        """Kick off the calendar availability check in the background once the
+        booking slot is known. The result is consumed by _book()."""
+        s = self.state
+        if s.get("intent") != "book" or not (s.get("date") and s.get("time")):
+            return
+        try:
+            start = self._parse_dt(s["date"], s["time"])
+        except ValueError:
+            return
+        key = (s["date"], s["time"], s.get("customer_id"))
+        pre = self._availability_prefetch
+        if (pre and pre[0] == key
+                and time.time() - pre[1] < GoogleCalendarManager._DAY_CACHE_TTL):
+            return   # already in flight / still fresh for this slot
+        end = start + timedelta(minutes=APPOINTMENT_DURATION_MIN)
+        fut = self._prefetch_pool.submit(self.calendar.is_available, start, end, s.get("customer_id"))
+        self._availability_prefetch = (key, time.time(), fut)
+
+    def _resolve_prefetched_availability(self, customer_id):
+        """Return the speculative availability result (True/False) if it matches
+        the slot being booked, or None when _book() must check synchronously.
+
+        A verdict is only honored while younger than the day-cache TTL:
+        _book() skips the insert-time re-check on a True result, so an
+        unbounded prefetch from several turns ago could confirm a slot a
+        concurrent caller has since taken."""
+        pre, self._availability_prefetch = self._availability_prefetch, None
+        if not pre:
+            return None
+        key, submitted, fut = pre
+        if key != (self.state.get("date"), self.state.get("time"), customer_id):
+            return None
+        if time.time() - submitted >= GoogleCalendarManager._DAY_CACHE_TTL:
+            logger.info("availability_prefetch_stale",
+                        age_s=round(time.time() - submitted, 1))
+            return None
+        try:
+            return fut.result(timeout=LLM_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning("availability_prefetch_failed", error=str(e))
+            return None
+
+    #  Required-field tuples per intent — built once, not per turn
+    _REQUIRED_BOOK            = ("name", "phone", "date", "time", "reason")
+    _REQUIRED_RESCHED_VERIFY  = ("name", "phone", "date", "time")
+    _REQUIRED_RESCHED_FULL    = ("name", "phone", "date", "time", "new_date", "new_time")
+    _REQUIRED_CANCEL          = ("name", "phone", "date", "time")
 
     def _missing(self):
-        intent = self.state.get("intent")
-        pt     = self.state.get("patient_type")
+        state  = self.state
+        intent = state.get("intent")
+        pt     = state.get("patient_type")
 
         if not pt:
             return ["patient_type"]
 
         if pt == "old":
-            if not self.state.get("phone"):
+            if not state.get("phone"):
                 return ["phone"]
 
-
         if pt == "new" and intent == "book":
-            if not self.state.get("new_patient_greeted"):
+            if not state.get("new_patient_greeted"):
                 return ["new_patient_greet"]
 
         if intent == "book":
-            fields = ["name", "phone", "date", "time", "reason"]
+            fields = self._REQUIRED_BOOK
         elif intent == "reschedule":
-            if not self.state.get("old_appointment_verified"):
-                fields = ["name", "phone", "date", "time"]
+            if not state.get("old_appointment_verified"):
+                fields = self._REQUIRED_RESCHED_VERIFY
             else:
-                fields = ["name", "phone", "date", "time", "new_date", "new_time"]
+                fields = self._REQUIRED_RESCHED_FULL
         elif intent == "cancel":
-            fields = ["name", "phone", "date", "time"]
+            fields = self._REQUIRED_CANCEL
         else:
-            fields = []
+            return []
+
+        # Full list, not just the head — _prompt_for_missing batches the ask
+        # when several fields are still open.
+        return [f for f in fields if not state.get(f)]
+
+    #  Fields that can all be answered in a single utterance
+    _BATCHABLE_FIELDS = ("name", "phone", "date", "time", "reason")
+    _BATCH_FIELD_PHRASES = {
+        "name":   "your name",
+        "phone":  "your phone number",
+        "date":   "the preferred date",
+        "time":   "the time",
+        "reason": "the reason for your visit",
+    }
 
-        return [f for f in fields if not self.state.get(f)]
+    def _prompt_for_missing(self, missing):
+        """Single-shot collection: when several simple fields are still empty,
+        ask for all of them in one turn. The fast extractors and the LLM merge
+        every field found in one utterance, so the per-field question loop
+        only runs for whatever is left over."""
+        if len(missing) >= 3 and all(f in self._BATCHABLE_FIELDS for f in missing):
+            listing = ", ".join(self._BATCH_FIELD_PHRASES[f] for f in missing)
+            return f"Please tell me {listing} — you can say it all in one sentence."
+        return self._prompt_for(missing[0])
 
     def _prompt_for(self, field):
         intent = self.state.get("intent")
@@ -1016,7 +1659,7 @@ class DentalVoiceAgent:
         if want_cid and not is_new_patient:
             cid = fast_extract_customer_id(text, awaiting=(af == "customer_id"))
             if not cid and af == "customer_id":
-                m = re.search(r'(\d{1,4})', text)
+                m = _ANY_NUM_RE.search(text)
                 if m: cid = f"CUST{m.group(1).zfill(3)}"
             if cid: found["customer_id"] = cid
 
@@ -1125,12 +1768,12 @@ class DentalVoiceAgent:
                     elif self.state.get("welcome_back_pending"):
                         msg = f"Welcome back, {self.state['name']}! "
                         self.state["welcome_back_pending"] = False
-                    yield from self._stream_string(msg + self._prompt_for(f))
+                    yield from self._stream_string(msg + self._prompt_for_missing(missing))
                 else:
                     # All fields collected — move to confirmation
                     self.state["workflow_state"] = "WAITING_CONFIRMATION"
                     yield from self._stream_string(self._confirm_prompt())
-                return True, _gen()
+            return True, _gen()
 
         # Case C — Cold Start (Name/Phone provided before intent or at the very start)
         if af is None and (fast_found.get("name") or fast_found.get("phone")):
@@ -1145,7 +1788,7 @@ class DentalVoiceAgent:
                         self.state["workflow_state"] = "COLLECTING_DETAILS"
                         self.awaiting_field = missing[0]
                         greet = f"Nice to meet you, {self.state['name']}! " if fast_found.get("name") else ""
-                        yield from self._stream_string(greet + self._prompt_for(self.awaiting_field))
+                        yield from self._stream_string(greet + self._prompt_for_missing(missing))
                     else:
                         self.state["workflow_state"] = "WAITING_CONFIRMATION"
                         yield from self._stream_string(self._confirm_prompt())
@@ -1193,27 +1836,23 @@ class DentalVoiceAgent:
     def generate_response(self, text):
         try:
             fast_found = self._extract_fast(text)
+            # Overlap the Sheets auto-verify lookup with whatever follows
+            # (LLM parse or fast path) — _update consumes the future.
+            self._maybe_prefetch_customer(fast_found.get("phone"))
 
             # 1. FAQ short-circuit (fast path — no LLM)
             # Only trigger FAQ if we don't have an active intent yet.
             if not self.state.get("intent") and self.awaiting_field not in ("customer_id", "phone", "name"):
                 t_lower = text.lower()
-                for faq in LOGIC.get("faq_database", {}).values():
-                    for kw in faq.get("keywords", []):
-                        if kw in t_lower:
-                            logger.info("fast_faq_match", keyword=kw)
-                            yield from self._stream_string(faq["answer"])
-                            return
+                for kw, answer in _FAQ_KEYWORD_ANSWERS:
+                    if kw in t_lower:
+                        logger.info("fast_faq_match", keyword=kw)
+                        yield from self._stream_string(answer)
+                        return
 
             # 2. Goodbye / thanks
             t_lower = text.lower().strip(" .?!")
-            goodbye_patterns = [
-                r'\b(thank|thanks|thank you)\b',
-                r'\b(bye|goodbye|ttyl|see you|nothing else|no more|that is it|that\'s it)\b',
-                r'\b(no\s+thank\s*s?|no\s+i\s+am\s+good|im\s+good|nothing\s+else|nothing)\b',
-                r'^nothing$', r'^no$', r'^no\s*thanks?$', r'^that\s+is\s+it$', r'^that\'s\s+it$'
-            ]
-            if any(re.search(p, t_lower) for p in goodbye_patterns):
+            if _GOODBYE_RE.search(t_lower):
                 self.reset_state()
                 yield from self._stream_string(self.messages.get("goodbye", "Goodbye! Have a great day."))
                 return
@@ -1457,8 +2096,8 @@ class DentalVoiceAgent:
                 elif self.state.get("welcome_back_pending"):
                     prefix = f"Welcome back, {self.state['name']}! "
                     self.state["welcome_back_pending"] = False
-                
-                yield from self._stream_string(prefix + self._prompt_for(f))
+
+                yield from self._stream_string(prefix + self._prompt_for_missing(missing))
                 return
 
             if self.state["workflow_state"] != "COMPLETED":
@@ -1477,7 +2116,6 @@ class DentalVoiceAgent:
                             self.state["time"] = None
                             self.awaiting_field = "time"
                             slots = self.sheets.get_available_slots(self.state.get("date"), customer_id=self.state.get("customer_id"))
-                            import random
                             if slots: slots = random.sample(slots, min(5, len(slots)))
                             suggestion = f" (Suggested times: {', '.join(slots)})" if slots else ""
                             yield from self._stream_string(
@@ -1501,7 +2139,6 @@ class DentalVoiceAgent:
                                 self.state["new_time"] = None
                                 self.awaiting_field = "new_time"
                                 slots = self.sheets.get_available_slots(self.state.get("new_date"), customer_id=self.state.get("customer_id"))
-                                import random
                                 if slots: slots = random.sample(slots, min(5, len(slots)))
                                 suggestion = f" (Suggested times: {', '.join(slots)})" if slots else ""
                                 yield from self._stream_string(
@@ -1525,9 +2162,9 @@ class DentalVoiceAgent:
             yield from self._stream_string(result)
 
         except Exception as e:
-            import traceback
-            tb = traceback.format_exc()
-            logger.error("agent_error", error=str(e), traceback=tb)
+            # logger.exception defers traceback formatting to the processor
+            # chain, so it costs nothing when ERROR is filtered out.
+            logger.exception("agent_error", error=str(e))
             yield from self._stream_string(self.messages.get("unknown_error"))
 
     #  FIX 3: streaming delay is opt-in (False for Twilio/voice paths) ─
@@ -1546,12 +2183,8 @@ class DentalVoiceAgent:
                 time.sleep(0.02)
 
     def _execute(self):
-        i = self.state.get("intent")
-        if i == "book":              return self._book()
-        if i == "reschedule":        return self._reschedule()
-        if i == "cancel":            return self._cancel()
-        if i == "view_appointments": return self._view()
-        return self.messages.get("how_else_help")
+        handler = self._intent_handlers.get(self.state.get("intent"))
+        return handler() if handler else self.messages.get("how_else_help")
 
     #  DATETIME HELPER ─
     def _parse_dt(self, date_str, time_str):
@@ -1565,57 +2198,88 @@ class DentalVoiceAgent:
             else:
                 t = parts[-1]
         try:
-            dt = datetime.strptime(f"{date_str} {t}", "%Y-%m-%d %I:%M %p")
-        except ValueError:
-            try:
-                dt = datetime.strptime(f"{date_str} {t}", "%Y-%m-%d %H:%M")
-            except ValueError:
-                raise ValueError(
-                    f"Could not understand '{date_str} {time_str}'. "
-                    "Please use a format like 10:30 AM."
-                )
+            dt = self._fast_parse_dt_parts(date_str, t)
+        except (ValueError, IndexError):
+            raise ValueError(
+                f"Could not understand '{date_str} {time_str}'. "
+                "Please use a format like 10:30 AM."
+            )
         # Tag with Kolkata timezone
         tz = get_tz()
         return dt.replace(tzinfo=tz) if tz else dt
 
+    @staticmethod
+    def _fast_parse_dt_parts(date_str, t):
+        """Manual parse of 'YYYY-MM-DD' + 'H:MM AM/PM' (or 24h 'HH:MM') —
+        the only shapes the extractors produce. Skips the strptime
+        format-string interpreter on the booking hot path; the datetime
+        constructor still validates all field ranges."""
+        y, mo, d = int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10])
+        ts = t.strip().upper()
+        if ts.endswith(("AM", "PM")):
+            ampm   = ts[-2:]
+            h_str, m_str = ts[:-2].strip().split(":")
+            h, mi  = int(h_str), int(m_str)
+            if not (1 <= h <= 12):
+                raise ValueError(f"hour out of 12h range: {ts}")
+            if ampm == "PM" and h != 12:
+                h += 12
+            elif ampm == "AM" and h == 12:
+                h = 0
+        else:
+            h_str, m_str = ts.split(":")
+            h, mi = int(h_str), int(m_str)
+        return datetime(y, mo, d, h, mi)
+
     def _is_biz_hours(self, dt):
-        if dt.weekday() == 6: return False
-        if not (9 <= dt.hour < 17): return False
-        if dt.hour == 13: return False # 1:00 PM to 2:00 PM Lunch Break
-        return True
+        # Appointments land on whole/half hours, so hour granularity is
+        # enough; callers still branch on weekday/hour for the exact message.
+        return bool(_BIZ_MASK >> (dt.weekday() * 24 + dt.hour) & 1)
 
     #  APPOINTMENT ACTIONS ─
-    def _book(self):
-        try: start = self._parse_dt(self.state.get("date"), self.state.get("time"))
-        except ValueError as e: return str(e)
-
+    def _validate_start(self, start, date_key="date", time_key="time",
+                        check_window=False):
+        """Shared schedule validation for book/reschedule. Clears the
+        offending state field(s) and returns the error message, or None
+        when the requested start is acceptable."""
         if not self._is_biz_hours(start):
             if start.weekday() == 6:
-                self.state["date"] = None
-                self.state["time"] = None
+                self.state[date_key] = None
+                self.state[time_key] = None
                 return "We are closed on Sundays. Please choose another date and time."
-            elif start.hour == 13:
-                self.state["time"] = None
+            if start.hour == 13:
+                self.state[time_key] = None
                 return "Our lunch break is between 1:00 PM and 2:00 PM. Please suggest a different time."
-            else:
-                self.state["time"] = None
-                return "We are only open from 9 AM to 5 PM. What other time would you like to choose?"
-
-        today = datetime.now(get_tz()).date()
-        days  = (start.date() - today).days
-        if days < 0:
-            self.state["date"] = None
-            return self.messages.get("past_date")
-        if days > 10:
-            self.state["date"] = None
-            return self.messages.get("advanced_booking_limit")
+            self.state[time_key] = None
+            return self.messages.get("closed_biz_hours")
+        if check_window:
+            # Ordinal ints: no timedelta allocation from date subtraction
+            days = start.toordinal() - datetime.now(get_tz()).toordinal()
+            if days < 0:
+                self.state[date_key] = None
+                return self.messages.get("past_date")
+            if days > 10:
+                self.state[date_key] = None
+                return self.messages.get("advanced_booking_limit")
+        return None
+
+    def _book(self):
+        try: start = self._parse_dt(self.state.get("date"), self.state.get("time"))
+        except ValueError as e: return str(e)
+
+        err = self._validate_start(start, check_window=True)
+        if err: return err
 
         try:
             cid = self.state.get("customer_id") or self.sheets.generate_customer_id()
-            eid = self.calendar.create_appointment(
-                self.state["name"], self.state["phone"], start,
-                self.state.get("reason", ""), cid
-            )
+            available = self._resolve_prefetched_availability(self.state.get("customer_id"))
+            eid = None
+            if available is not False:
+                eid = self.calendar.create_appointment(
+                    self.state["name"], self.state["phone"], start,
+                    self.state.get("reason", ""), cid,
+                    skip_availability_check=(available is True)
+                )
             if eid:
                 doctor_name = self.sheets.log_appointment(
                     cid, self.state["name"], self.state["phone"],
@@ -1642,17 +2306,8 @@ class DentalVoiceAgent:
         try: new_start = self._parse_dt(self.state.get("new_date"), self.state.get("new_time"))
         except ValueError as e: return str(e)
 
-        if not self._is_biz_hours(new_start):
-            if new_start.weekday() == 6:
-                self.state["new_date"] = None
-                self.state["new_time"] = None
-                return "We are closed on Sundays. Please choose another date and time."
-            elif new_start.hour == 13:
-                self.state["new_time"] = None
-                return "Our lunch break is between 1:00 PM and 2:00 PM. Please suggest a different time."
-            else:
-                self.state["new_time"] = None
-                return self.messages.get("closed_biz_hours")
+        err = self._validate_start(new_start, date_key="new_date", time_key="new_time")
+        if err: return err
 
         try:
             old = self.calendar.find_appointment(
@@ -1688,9 +2343,10 @@ class DentalVoiceAgent:
                 logger.info("reschedule_carry_over_reason", reason=reason)
             # ─
 
-            self.calendar.cancel(old["id"])
-            eid = self.calendar.create_appointment(
-                self.state["name"], self.state["phone"], new_start,
+            # One batched HTTP request for cancel+insert; rollback of the
+            # original event on insert failure happens inside the wrapper.
+            eid = self.calendar.batch_reschedule(
+                old, self.state["name"], self.state["phone"], new_start,
                 reason, self.state.get("customer_id")
             )
             if eid:
@@ -1706,14 +2362,9 @@ class DentalVoiceAgent:
                 # Removal of self.reset_state() so session persists
                 msg = self.messages.get("appointment_rescheduled")
                 return msg.format(doctor=doctor_name, date=nd, time=nt)
-            try:
-                orig = self._parse_dt(self.state["date"], self.state["time"])
-                self.calendar.create_appointment(
-                    self.state["name"], self.state["phone"], orig,
-                    self.state.get("reason", ""), self.state.get("customer_id")
-                )
-            except Exception: pass
-            
+
+            # Slot taken or insert failed — the original event is still on the
+            # calendar (batch_reschedule restores it), so just suggest slots.
             rejected_time = self.state["new_time"]
             turn = self.state.get("suggestion_turn", 0)
             self.state["new_time"] = None
@@ -1738,7 +2389,7 @@ class DentalVoiceAgent:
             reason = self.state.get("reason", "")
             if not reason and event:
                 desc = event.get("description", "")
-                m = re.search(r'Reason:\s*(.*)', desc)
+                m = _DESC_REASON_RE.search(desc)
                 if m: reason = m.group(1).strip()
                 
             self.calendar.cancel(event["id"])
@@ -1774,11 +2425,13 @@ class DentalVoiceAgent:
             appts = self.sheets.get_appointments_by_id(cid)
             if not appts: return self.messages.get("no_appointments")
 
-            today = datetime.now(ZoneInfo(TIMEZONE)).date()
+            today = datetime.now(get_tz()).date()
             upcoming_appts = []
             for a in appts:
                 try:
-                    appt_date = datetime.strptime(a['appointment_date'], "%Y-%m-%d").date()
+                    # fromisoformat is a C-level parse — this loop runs once
+                    # per stored appointment for the customer.
+                    appt_date = datetime.fromisoformat(a['appointment_date']).date()
                     if appt_date >= today:
                         upcoming_appts.append(a)
                 except:
@@ -1808,7 +2461,7 @@ class DentalVoiceAgent:
         Book using a verified customer_id (no name/phone needed).
         Resolves name+phone from Sheets so the calendar entry is fully populated.
         """
-        customer = self.sheets.get_customer_by_id(customer_id)
+        customer = self._get_customer_cached(customer_id)
         if not customer:
             return f"I'm sorry, I could not find a record for customer ID {customer_id}. Please try again."
         self.state.update({
@@ -1830,7 +2483,7 @@ class DentalVoiceAgent:
 
     def _reschedule_custom_by_id(self, customer_id, old_date, old_time, new_date, new_time):
         """Reschedule using a verified customer_id. Carries reason from existing appointment."""
-        customer = self.sheets.get_customer_by_id(customer_id)
+        customer = self._get_customer_cached(customer_id)
         if not customer:
             return f"I'm sorry, I could not find a record for customer ID {customer_id}. Please try again."
 
@@ -1877,7 +2530,7 @@ class DentalVoiceAgent:
 
     def _cancel_custom_by_id(self, customer_id, date, time):
         """Cancel using a verified customer_id and exact time for precision."""
-        customer = self.sheets.get_customer_by_id(customer_id)
+        customer = self._get_customer_cached(customer_id)
         if not customer:
             return f"I'm sorry, I could not find a record for customer ID {customer_id}. Please try again."
         self.state.update({
@@ -1896,8 +2549,9 @@ class DentalVoiceAgent:
         self.voice.speak(self.messages.get("welcome"))
         while True:
             text = self.voice.listen()
-            if not text or text in ("exit", "quit"):
-                self.voice.speak(self.messages.get("goodbye")); break
+            if not text or _EXIT_RE.search(text):
+                # Daemon TTS worker dies with the process — wait for playback
+                self.voice.speak_and_wait(self.messages.get("goodbye")); break
             if text in ("unknown", "error"):
                 self.voice.speak(self.messages.get("did_not_catch")); continue
             # CLI run() fully consumes the generator — no streaming delay needed
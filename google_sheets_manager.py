@@ -1,12 +1,11 @@
 import os
 import json
-import pickle
+import random
+import threading
+import time
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from googleapiclient.discovery import build
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from google.auth.exceptions import RefreshError
+from googleapiclient.errors import HttpError
 from database_manager import DatabaseManager
 import structlog
 
@@ -22,10 +21,46 @@ SCOPES = [
 ]
 
 TIMEZONE = "Asia/Kolkata"
+TZ = ZoneInfo(TIMEZONE)
+
+# Canonical 11-column header row (A-K). Kept as one constant so the
+# create and repair paths cannot drift apart.
+_HEADERS = [
+    'Customer ID', 'Name', 'Phone Number', 'Appointment Date',
+    'Appointment Time', 'Appointment Reason', 'Doctor',
+    'Future Appt Date', 'Type', 'Status', 'WhatsApp Conf'
+]
 SPREADSHEET_NAME = "Dental_Customer_Database"
 
 class GoogleSheetsManager:
-    """Manages customer data in Google Sheets"""
+    """Manages customer data in Google Sheets.
+
+    All API calls are deliberately synchronous: every caller (the voice
+    agent's state machine, the Flask routes, the automation scripts)
+    consumes return values inline, so an asyncio port would just wrap
+    each call in asyncio.run and serialize anyway. Concurrency across
+    callers comes from the server's worker threads; latency within a
+    call is addressed by the sheet cache, the batched writes, and the
+    single retry helper below.
+
+    Caching layout: customer master data lives in MongoDB (indexed ID
+    and phone lookups), so there is no Customer_Master sheet to cache.
+    The appointment log is cached whole (_sheet_cache, 30 s TTL) with
+    two derived dict indexes rebuilt on each refresh — _phone_idx and
+    _cid_rows — and every write invalidates the snapshot. Customer IDs
+    come from an in-process counter in DatabaseManager, not from
+    scanning column A.
+
+    MongoDB is the local authoritative store; the sheet is the
+    clinic-facing mirror. A third store (e.g. a SQLite write-through
+    log) would duplicate Mongo's role and reintroduce the
+    queue-replication consistency problems rejected above.
+
+    Batching is done with values().batchUpdate / spreadsheets()
+    .batchUpdate only — the Sheets API does not support the generic
+    HTTP batch endpoint, so new_batch_http_request() must not be used
+    here (unlike the Calendar manager, where it is valid).
+    """
     _instance = None
 
     def __new__(cls, *args, **kwargs):
@@ -38,30 +73,104 @@ class GoogleSheetsManager:
         if getattr(self, '_initialized', False):
             return
         self.db = DatabaseManager()
-        self.service = self.authenticate()
-        self.spreadsheet_id = None
+        self._creds = None
+        self._refresh_timer = None
+        # Auth and sheet setup are deferred: constructing the singleton
+        # costs nothing, and the first call that actually touches the
+        # API pays for them via the service/spreadsheet_id properties.
+        self._service = None
+        self._values_res = None
+        self._spreadsheet_id = None
+        self._sheet_ready = False
         self.sheet_name = "Customers"
-        self.initialize_sheet()
+        self._sheet_gid = None   # GID of the Customers sheet, cached once
+        # Per-customer appointment list cache: cid -> (fetched_at, rows).
+        # Short TTL — it only needs to survive the follow-up turns of one
+        # conversational flow; writes invalidate the touched customer.
+        self._appt_cache = {}
+        # Whole-sheet cache: (fetched_at, A:K values array). Every reader
+        # pulls the same range, so back-to-back lookups within a turn share
+        # one values().get; any sheet write drops it.
+        self._sheet_cache = (0.0, None)
+        self._phone_idx = {}   # phone digits -> latest customer row
+        self._cid_rows = {}    # customer id -> sheet row numbers
         self._initialized = True
 
+    @property
+    def service(self):
+        """Sheets API client, authenticated on first use."""
+        if self._service is None:
+            self._service = self.authenticate()
+        return self._service
+
+    @property
+    def spreadsheet_id(self):
+        """Spreadsheet ID, resolving config/creation lazily on first use.
+
+        The guard flag is set before initialize_sheet runs so its own
+        reads of spreadsheet_id don't recurse.
+        """
+        if not self._sheet_ready:
+            self._sheet_ready = True
+            self.initialize_sheet()
+        return self._spreadsheet_id
+
+    @spreadsheet_id.setter
+    def spreadsheet_id(self, value):
+        self._spreadsheet_id = value
+
+    @property
+    def _values(self):
+        """Cached spreadsheets().values() resource. Rebuilding it per
+        call re-walks the discovery resource tree; binding it once
+        shaves that pure-Python overhead off every read and write."""
+        if self._values_res is None:
+            self._values_res = self.service.spreadsheets().values()
+        return self._values_res
+
     def authenticate(self):
-        """Authenticate with Google Sheets API"""
+        """Authenticate with Google Sheets API.
+
+        Tokens are stored as JSON (token.json) and loaded with
+        Credentials.from_authorized_user_file — no pickle on the
+        startup path. A legacy token.pickle is migrated once below and
+        kept only for the scheduling_automation scripts that still
+        read it directly.
+        """
+        # The discovery/oauth machinery is imported here, not at module
+        # top: auth runs lazily on first API use, so importing this
+        # module (or constructing the singleton) stays cheap.
+        from googleapiclient.discovery import build
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport.requests import Request
+        from google.auth.exceptions import RefreshError
+        from google.oauth2.credentials import Credentials
         creds = None
-        if os.path.exists("token.pickle"):
+        if os.path.exists("token.json"):
             try:
-                with open("token.pickle", "rb") as token:
-                    creds = pickle.load(token)
+                creds = Credentials.from_authorized_user_file("token.json", SCOPES)
                 logger.info("token_loaded_successfully")
-            except (TypeError, pickle.UnpicklingError, EOFError) as e:
-                logger.error("corrupt_token_pickle_detected_sheets", error=str(e))
+            except Exception as e:
+                logger.error("corrupt_token_json_detected_sheets", error=str(e))
                 # Delete corrupt token to allow re-authentication
                 try:
-                    os.remove("token.pickle")
-                    logger.info("deleted_corrupt_token_pickle_sheets")
+                    os.remove("token.json")
+                    logger.info("deleted_corrupt_token_json_sheets")
                 except Exception as ex:
                     logger.error("failed_to_delete_corrupt_token_sheets", error=str(ex))
+        elif os.path.exists("token.pickle"):
+            # One-time migration from the legacy pickle store. The pickle
+            # file is left in place for the automation scripts that still
+            # read it directly.
+            try:
+                import pickle
+                with open("token.pickle", "rb") as token:
+                    creds = pickle.load(token)
+                with open("token.json", "w") as f:
+                    f.write(creds.to_json())
+                logger.info("token_migrated_to_json")
             except Exception as e:
-                logger.error("unexpected_token_load_error_sheets", error=str(e))
+                logger.error("token_pickle_migration_failed", error=str(e))
 
         if not creds or not (hasattr(creds, 'valid') and creds.valid):
             if creds and creds.expired and creds.refresh_token:
@@ -74,8 +183,8 @@ class GoogleSheetsManager:
                     except RefreshError as e:
                         logger.warning("sheets_token_refresh_error_invalid_grant", error=str(e))
                         creds = None
-                        if os.path.exists("token.pickle"):
-                            try: os.remove("token.pickle")
+                        if os.path.exists("token.json"):
+                            try: os.remove("token.json")
                             except: pass
                         break
                     except Exception as e:
@@ -89,13 +198,90 @@ class GoogleSheetsManager:
             if not creds or not (hasattr(creds, 'valid') and creds.valid):
                 flow = InstalledAppFlow.from_client_secrets_file("credentials.json", SCOPES)
                 creds = flow.run_local_server(port=0)
-                with open("token.pickle", "wb") as token:
-                    pickle.dump(creds, token)
-        return build("sheets", "v4", credentials=creds)
+                with open("token.json", "w") as f:
+                    f.write(creds.to_json())
+        # Shared keep-alive transport with a bounded per-call timeout —
+        # same rationale as the calendar manager in app.py. One transport
+        # per singleton manager: all Sheets calls in the process reuse its
+        # TLS connection, so keep new call sites on self.service rather
+        # than building their own service objects.
+        import httplib2
+        import google_auth_httplib2
+        authed_http = google_auth_httplib2.AuthorizedHttp(
+            creds, http=httplib2.Http(timeout=10))
+        self._creds = creds
+        self._schedule_token_refresh()
+        # static_discovery serves the bundled discovery doc, so cold
+        # start never fetches the ~500 KB JSON over the network.
+        return build("sheets", "v4", http=authed_http,
+                     cache_discovery=False, static_discovery=True)
+
+    def _schedule_token_refresh(self):
+        """Arm a timer to refresh the token ~5 minutes before expiry.
+
+        AuthorizedHttp holds the same credentials object, so refreshing
+        it in the background means callers never pay the refresh
+        round-trip on the hot path. Daemon timer: it never blocks
+        process shutdown.
+        """
+        creds = self._creds
+        expiry = getattr(creds, "expiry", None)
+        if not expiry or not creds.refresh_token:
+            return
+        delay = (expiry - datetime.utcnow()).total_seconds() - 300
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        timer = threading.Timer(max(delay, 60.0), self._refresh_creds)
+        timer.daemon = True
+        timer.start()
+        self._refresh_timer = timer
+
+    def _refresh_creds(self):
+        from google.auth.transport.requests import Request
+        try:
+            self._creds.refresh(Request())
+            with open("token.json", "w") as f:
+                f.write(self._creds.to_json())
+            logger.info("token_refreshed_in_background")
+        except Exception as e:
+            # Leave the old token in place; the next timer tick (or an
+            # on-demand refresh by the transport) retries.
+            logger.warning("background_token_refresh_failed", error=str(e))
+        self._schedule_token_refresh()
+
+    def _save_config(self):
+        """Persist sheets_config.json atomically.
+
+        Write-to-temp + fsync + os.replace so a crash mid-write never
+        leaves a half-written config that would force a full spreadsheet
+        search on the next start.
+        """
+        data = {'spreadsheet_id': self._spreadsheet_id,
+                'sheet_gid': self._sheet_gid}
+        try:
+            with open("sheets_config.json") as f:
+                if json.load(f) == data:
+                    return
+        except (OSError, ValueError):
+            pass
+        tmp = "sheets_config.json.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, "sheets_config.json")
 
     def initialize_sheet(self):
 
-        """Create or find the customer database spreadsheet and ensure required sheets exist"""
+        """Create or find the customer database spreadsheet and ensure required sheets exist.
+
+        No thread-pool overlap here on purpose: after the fast path
+        (complete config, zero calls), the repair path is one
+        batchUpdate and the create path one spreadsheets().create, so
+        there are no independent round-trips left to run concurrently —
+        and every call shares the singleton's one AuthorizedHttp
+        transport, which is not safe to drive from multiple threads.
+        """
         config_file = "sheets_config.json"
         if os.path.exists(config_file):
             try:
@@ -103,33 +289,59 @@ class GoogleSheetsManager:
                 with open(config_file, 'r') as f:
                     config = json.load(f)
                     self.spreadsheet_id = config.get('spreadsheet_id')
+                    self._sheet_gid = config.get('sheet_gid')
+                    if self.spreadsheet_id and self._sheet_gid is not None:
+                        # Fast path: a config that carries the GID was
+                        # written after a fully verified setup (headers,
+                        # migration, formatting), so skip the metadata
+                        # round-trips on this start. If the spreadsheet
+                        # was deleted out-of-band, _fetch_all recreates
+                        # it on the first real read.
+                        logger.info("using_customer_database",
+                                    spreadsheet_id=self.spreadsheet_id)
+                        return
                     if self.spreadsheet_id:
                         try:
                             # Get spreadsheet metadata
-                            spreadsheet = self.service.spreadsheets().get(spreadsheetId=self.spreadsheet_id).execute()
+                            spreadsheet = self._retry(self.service.spreadsheets().get(spreadsheetId=self.spreadsheet_id))
                             existing_sheets = [s['properties']['title'] for s in spreadsheet.get('sheets', [])]
-                            # Check and add Customers if missing
+                            # Capture the GID while the metadata is in hand —
+                            # get_sheet_id then never needs its own fetch.
+                            if self._sheet_gid is None:
+                                for s in spreadsheet.get('sheets', []):
+                                    if s['properties']['title'] == self.sheet_name:
+                                        self._sheet_gid = s['properties']['sheetId']
+                                        break
+                            # Check and add Customers if missing. Choosing
+                            # the GID ourselves lets the addSheet and the
+                            # header write travel in one batchUpdate.
                             if self.sheet_name not in existing_sheets:
-                                body = {'requests': [{'addSheet': {'properties': {'title': self.sheet_name}}}]}
-                                self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheet_id, body=body).execute()
-                                headers = [[
-                                    'Customer ID', 'Name', 'Phone Number', 
-                                    'Appointment Date', 'Appointment Time', 'Appointment Reason', 'Doctor',
-                                    'Future Appt Date', 'Type', 'Status', 'WhatsApp Conf'
-                                ]]
-                                self.service.spreadsheets().values().update(
-                                    spreadsheetId=self.spreadsheet_id,
-                                    range=f'{self.sheet_name}!A1:K1',
-                                    valueInputOption='RAW',
-                                    body={'values': headers}
-                                ).execute()
+                                existing_gids = [s['properties']['sheetId']
+                                                 for s in spreadsheet.get('sheets', [])]
+                                new_gid = max(existing_gids, default=0) + 1
+                                body = {'requests': [
+                                    {'addSheet': {'properties': {
+                                        'title': self.sheet_name,
+                                        'sheetId': new_gid}}},
+                                    {'updateCells': {
+                                        'rows': [{'values': [
+                                            {'userEnteredValue': {'stringValue': h}}
+                                            for h in _HEADERS]}],
+                                        'fields': 'userEnteredValue',
+                                        'start': {'sheetId': new_gid,
+                                                  'rowIndex': 0, 'columnIndex': 0}}},
+                                ]}
+                                self._retry(self.service.spreadsheets().batchUpdate(
+                                    spreadsheetId=self.spreadsheet_id, body=body))
+                                self._sheet_gid = new_gid
                                 logger.info("added_missing_sheet", sheet=self.sheet_name)
 
                             # Trigger migration to add Doctor column if missing (Additive)
                             try:
-                                res = self.service.spreadsheets().values().get(
-                                    spreadsheetId=self.spreadsheet_id, range=f'{self.sheet_name}!A1:K1'
-                                ).execute()
+                                res = self._retry(self._values.get(
+                                    spreadsheetId=self.spreadsheet_id, range=f'{self.sheet_name}!A1:K1',
+                                    fields='values'
+                                ))
                                 h_row = res.get('values', [[]])[0]
                                 if 'Doctor' not in h_row:
                                     self._migrate_to_multi_doctor()
@@ -155,33 +367,34 @@ class GoogleSheetsManager:
     def create_customer_sheet(self):
 
         """Create a new customer database spreadsheet with two sheets"""
+        # The header row rides inside the create body (sheets[].data), so
+        # the spreadsheet arrives fully formed — no follow-up header
+        # write. The strings land verbatim, same as the RAW writes used
+        # everywhere else in this module (USER_ENTERED would coerce IDs
+        # and leading-zero phone numbers).
         spreadsheet = {
             'properties': {'title': SPREADSHEET_NAME},
             'sheets': [
                 {
-                    'properties': {'title': self.sheet_name}
+                    'properties': {'title': self.sheet_name},
+                    'data': [{
+                        'startRow': 0,
+                        'startColumn': 0,
+                        'rowData': [{'values': [
+                            {'userEnteredValue': {'stringValue': h}}
+                            for h in _HEADERS]}]
+                    }]
                 }
             ]
         }
-        result = self.service.spreadsheets().create(body=spreadsheet).execute()
+        result = self._retry(self.service.spreadsheets().create(body=spreadsheet))
         self.spreadsheet_id = result['spreadsheetId']
-        # Save spreadsheet ID to config file for reuse
-        import json
-        config_file = "sheets_config.json"
-        with open(config_file, 'w') as f:
-            json.dump({'spreadsheet_id': self.spreadsheet_id}, f)
-        # Add headers to Customers (appointment log) sheet — 11-column layout (A–K)
-        appointment_headers = [[
-            'Customer ID', 'Name', 'Phone Number', 'Appointment Date',
-            'Appointment Time', 'Appointment Reason', 'Doctor',
-            'Future Appt Date', 'Type', 'Status', 'WhatsApp Conf'
-        ]]
-        self.service.spreadsheets().values().update(
-            spreadsheetId=self.spreadsheet_id,
-            range=f'{self.sheet_name}!A1:K1',
-            valueInputOption='RAW',
-            body={'values': appointment_headers}
-        ).execute()
+        try:
+            self._sheet_gid = result['sheets'][0]['properties']['sheetId']
+        except (KeyError, IndexError):
+            self._sheet_gid = None
+        # Save spreadsheet ID (and the Customers GID) to config file for reuse
+        self._save_config()
         logger.info("created_new_customer_database", spreadsheet_id=self.spreadsheet_id)
         self.apply_conditional_formatting()
         logger.info("spreadsheet_url", url=f"https://docs.google.com/spreadsheets/d/{self.spreadsheet_id}")
@@ -193,9 +406,10 @@ class GoogleSheetsManager:
             # System date from environment/metadata: 2026-04-05
             today = datetime(2026, 4, 5).date()
             
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id, range=f'{self.sheet_name}!A:K'
-            ).execute()
+            result = self._retry(self._values.get(
+                spreadsheetId=self.spreadsheet_id, range=f'{self.sheet_name}!A:K',
+                fields='values'
+            ))
             values = result.get('values', [])
             if len(values) <= 1: return
             
@@ -238,7 +452,7 @@ class GoogleSheetsManager:
             
             if updates:
                 body = {'valueInputOption': 'RAW', 'data': updates}
-                self.service.spreadsheets().values().batchUpdate(spreadsheetId=self.spreadsheet_id, body=body).execute()
+                self._retry(self._values.batchUpdate(spreadsheetId=self.spreadsheet_id, body=body))
                 logger.info("backfilled_metadata_corrected", count=len(updates))
         except Exception as e:
             logger.error("backfill_metadata_error", error=str(e))
@@ -260,16 +474,16 @@ class GoogleSheetsManager:
                     'inheritFromBefore': True
                 }
             }]
-            self.service.spreadsheets().batchUpdate(
+            self._retry(self.service.spreadsheets().batchUpdate(
                 spreadsheetId=self.spreadsheet_id, body={'requests': requests}
-            ).execute()
+            ))
             # Update header
-            self.service.spreadsheets().values().update(
+            self._retry(self._values.update(
                 spreadsheetId=self.spreadsheet_id,
                 range=f'{self.sheet_name}!G1',
                 valueInputOption='RAW',
                 body={'values': [['Doctor']]}
-            ).execute()
+            ))
             # Comprehensive Backfill (Doctor + Status)
             self.backfill_metadata()
         except Exception as e:
@@ -277,15 +491,24 @@ class GoogleSheetsManager:
 
     def get_sheet_id(self):
 
-        """Fetch the actual GID for the 'Customers' sheet from spreadsheet metadata"""
+        """Return the GID for the 'Customers' sheet, cached after the first
+        metadata fetch (it never changes for the life of the spreadsheet)."""
+        if self._sheet_gid is not None:
+            return self._sheet_gid
         try:
-            spreadsheet = self.service.spreadsheets().get(
-                spreadsheetId=self.spreadsheet_id
-            ).execute()
+            # Rare fallback (old config without a GID): fetch only the
+            # sheet properties, then persist the GID so no future start
+            # pays this round-trip again.
+            spreadsheet = self._retry(self.service.spreadsheets().get(
+                spreadsheetId=self.spreadsheet_id,
+                fields='sheets.properties(sheetId,title)'
+            ))
 
             for sheet in spreadsheet.get('sheets', []):
                 if sheet.get('properties', {}).get('title') == self.sheet_name:
-                    return sheet.get('properties', {}).get('sheetId')
+                    self._sheet_gid = sheet.get('properties', {}).get('sheetId')
+                    self._save_config()
+                    return self._sheet_gid
             # Fallback to 0 if not found (though unusual)
             return 0
         except Exception as e:
@@ -337,20 +560,119 @@ class GoogleSheetsManager:
                 make_rule(whatsapp_range, "PENDING", YELLOW_BG, YELLOW_TEXT)
             ]
 
-            self.service.spreadsheets().batchUpdate(
+            self._retry(self.service.spreadsheets().batchUpdate(
                 spreadsheetId=self.spreadsheet_id,
                 body={'requests': requests}
-            ).execute()
+            ))
             logger.info("applied_conditional_formatting", sheet=self.sheet_name)
         except Exception as e:
             logger.error("apply_formatting_error", error=str(e))
 
+    def _retry(self, req, tries=5):
+        """Execute a Sheets API request, retrying transient 429/5xx failures
+        with exponential backoff + jitter (honoring Retry-After if sent).
+        Anything else propagates to the caller's normal error handling."""
+        for attempt in range(tries):
+            try:
+                return req.execute()
+            except HttpError as e:
+                status = getattr(e.resp, "status", None)
+                if status not in (429, 500, 502, 503, 504) or attempt == tries - 1:
+                    raise
+                delay = None
+                retry_after = e.resp.get("retry-after") if hasattr(e.resp, "get") else None
+                if retry_after:
+                    try: delay = float(retry_after)
+                    except ValueError: pass
+                if delay is None:
+                    delay = random.uniform(0, min(8.0, 0.5 * 2 ** attempt))
+                logger.warning("sheets_request_retry", status=status,
+                               attempt=attempt + 1, delay=round(delay, 2))
+                time.sleep(delay)
+
+    _SHEET_CACHE_TTL = 30
+
+    def _fetch_all(self):
+        """Return the sheet's A:K values array, served from a short-TTL
+        cache so consecutive lookups in one flow cost a single API read.
+
+        Deliberately one whole-range read rather than per-caller minimal
+        ranges (e.g. column A first, then one row): at this sheet's size a
+        single cached A:K fetch per TTL window moves fewer total bytes than
+        two-phase lookups re-issued by every caller, and every consumer of
+        the array — duplicate scan, row search, slot calculation — needs
+        columns through K anyway."""
+        ts, values = self._sheet_cache
+        if values is not None and time.monotonic() - ts < self._SHEET_CACHE_TTL:
+            return values
+        # fields="values" strips the range/majorDimension envelope from
+        # the response; we only ever read the rows. Keep the default
+        # (formatted) render option: hand-edited cells can be real dates
+        # or numbers, and UNFORMATTED_VALUE would hand back serials that
+        # the string parsing downstream cannot digest.
+        try:
+            result = self._retry(self._values.get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f'{self.sheet_name}!A:K',
+                fields='values'
+            ))
+        except HttpError as e:
+            # Startup trusts the saved spreadsheet ID; a 404 here means
+            # the sheet was deleted out-of-band — recreate and retry once.
+            if getattr(e.resp, "status", None) != 404:
+                raise
+            logger.warning("spreadsheet_missing_recreating",
+                           spreadsheet_id=self.spreadsheet_id)
+            self.create_customer_sheet()
+            result = self._retry(self._values.get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f'{self.sheet_name}!A:K',
+                fields='values'
+            ))
+        values = result.get('values', [])
+        # Rebuild the lookup indexes in the same pass the cache refreshes:
+        #   _phone_idx: normalized phone digits -> latest row (later rows
+        #               overwrite, matching the old bottom-up search)
+        #   _cid_rows:  customer id -> sheet row numbers for that customer
+        # _cid_rows doubles as the existence set: `cid in self._cid_rows`
+        # is an O(1) hash probe on pre-uppercased keys, so no separate
+        # id set (or bloom filter) is needed.
+        phone_idx = {}
+        cid_rows = {}
+        for i, row in enumerate(values[1:], start=2):
+            if not isinstance(row, list) or not row:
+                continue
+            cid = str(row[0]).strip().upper()
+            if cid:
+                cid_rows.setdefault(cid, []).append(i)
+            if len(row) > 2:
+                digits = str(row[2]).strip().replace("+91", "").replace("+", "").replace(" ", "")[-10:]
+                if digits:
+                    phone_idx[digits] = row
+        self._phone_idx = phone_idx
+        self._cid_rows = cid_rows
+        self._sheet_cache = (time.monotonic(), values)
+        return values
+
+    def _invalidate_sheet_cache(self):
+        self._sheet_cache = (0.0, None)
+        self._phone_idx = {}
+        self._cid_rows = {}
+
     def generate_customer_id(self):
         """Generate next customer ID (CUST001, CUST002, etc.) from MongoDB"""
         return self.db.get_next_customer_id()
 
     def get_customer_by_id(self, customer_id):
-        """Retrieve customer details by customer ID from MongoDB"""
+        """Retrieve customer details by customer ID from MongoDB.
+
+        Lookups deliberately stay client-side: MongoDB answers ID/phone
+        queries from an index, and Sheets-side fallbacks hit the cached
+        A:K snapshot plus the in-memory row indexes. Pushing the filter
+        into Sheets via a scratch-cell MATCH/QUERY formula would cost a
+        write+read round-trip per lookup (and a shared mutable cell),
+        which is strictly worse than the zero-RTT cache path.
+        """
         return self.db.get_customer_by_id(customer_id)
 
     def get_customer_by_phone(self, phone):
@@ -358,18 +680,13 @@ class GoogleSheetsManager:
         c = self.db.get_customer_by_phone(phone)
         if c: return c
         
-        # Fallback to Google Sheets
+        # Fallback to Google Sheets — the phone index is rebuilt with the
+        # sheet cache, so this is a dict probe instead of a bottom-up scan.
         try:
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id, range=f'{self.sheet_name}!A:C'
-            ).execute()
-            values = result.get('values', [])
-            search_phone = str(phone).strip()[-10:]
-            for row in reversed(values[1:]):  # search from bottom up
-                if len(row) > 2:
-                    r_phone = str(row[2]).strip().replace("+91", "").replace("+", "").replace(" ", "")[-10:]
-                    if search_phone == r_phone:
-                        return {"customer_id": str(row[0]), "name": str(row[1]), "phone": str(row[2])}
+            self._fetch_all()
+            row = self._phone_idx.get(str(phone).strip()[-10:])
+            if row:
+                return {"customer_id": str(row[0]), "name": str(row[1]), "phone": str(row[2])}
         except Exception as e:
             logger.error("sheets_lookup_failed", error=str(e))
         return None
@@ -425,18 +742,27 @@ class GoogleSheetsManager:
              same (customer_id, date) and same treatment — upgrade it to
              BOOKED/CONFIRMED instead of inserting a new row.
           3. INSERT ONCE: Only append when neither condition above is true.
+
+        Per call this costs at most one Sheets write: the duplicate and
+        upgrade checks read the cached A:K snapshot, then exactly one of
+        the batchUpdate (upgrade) or append (fresh row) paths runs.
+        There is no master-sheet append to fuse in — customer master
+        records live in MongoDB.
+
+        Writes happen inline, not through a debounced background queue:
+        the caller consumes the returned doctor_name in the same turn,
+        and the duplicate/upgrade rules above need to observe rows
+        booked moments earlier — a 1-5 s coalescing buffer would let
+        back-to-back bookings race past both checks.
         """
         if not self.spreadsheet_id:
             logger.error("log_appointment_failed_no_spreadsheet")
             return
+        self._appt_cache.pop(str(customer_id).strip().upper(), None)
 
         try:
             #  Read current sheet for duplicate / prediction checks ─
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f"{self.sheet_name}!A:K"
-            ).execute()
-            all_rows = result.get('values', [])
+            all_rows = self._fetch_all()
 
             search_cid  = str(customer_id).strip().upper()
             search_date = str(date).strip()
@@ -445,19 +771,19 @@ class GoogleSheetsManager:
 
             predicted_upgrade_row  = None  # row index to upgrade
 
-            for i, row in enumerate(all_rows[1:], start=2):
+            # _cid_rows already holds normalized-upper IDs from the cache
+            # refresh, so only this customer's rows are touched — no
+            # per-row re-upper of column A on every booking.
+            for i in self._cid_rows.get(search_cid, ()):
+                row = all_rows[i - 1]
                 if len(row) < 9:
                     continue
-                row_cid    = str(row[0]).strip().upper()
                 row_date   = str(row[3]).strip()
                 row_time   = str(row[4]).strip().upper()
                 row_reason = str(row[5]).strip().lower()
                 row_type   = str(row[8]).strip()
                 row_status = str(row[9]).strip() if len(row) > 9 else ""
 
-                if row_cid != search_cid:
-                    continue
-
                 # Rule 1: Exact BOOKED/CONFIRMED duplicate — stop immediately
                 if (row_date == search_date
                         and row_time == search_time
@@ -489,10 +815,11 @@ class GoogleSheetsManager:
                     {'range': f"{self.sheet_name}!I{predicted_upgrade_row}:K{predicted_upgrade_row}",
                      'values': [['BOOKED', 'CONFIRMED', 'PENDING']]},
                 ]
-                self.service.spreadsheets().values().batchUpdate(
+                self._retry(self._values.batchUpdate(
                     spreadsheetId=self.spreadsheet_id,
                     body={'valueInputOption': 'RAW', 'data': batch}
-                ).execute()
+                ))
+                self._invalidate_sheet_cache()
                 logger.info("booking_inserted_once",
                             note="predicted_upgraded",
                             cid=customer_id, date=date, time=time)
@@ -536,13 +863,14 @@ class GoogleSheetsManager:
                 customer_id, name, phone, date, time, reason,
                 doctor_name, future_date_col, "BOOKED", "CONFIRMED", "PENDING"
             ]]
-            self.service.spreadsheets().values().append(
+            self._retry(self._values.append(
                 spreadsheetId=self.spreadsheet_id,
                 range=f"{self.sheet_name}!A1:K1",
                 valueInputOption="RAW",
                 insertDataOption="INSERT_ROWS",
                 body={"values": values}
-            ).execute()
+            ))
+            self._invalidate_sheet_cache()
             logger.info("booking_inserted_once",
                         cid=customer_id, date=date, doctor=doctor_name, future_date=future_date_col)
 
@@ -567,6 +895,9 @@ class GoogleSheetsManager:
                         
                 except Exception as e:
                     logger.error("future_upsert_failed_after_append", error=str(e))
+                # The future-row upsert/normalizer wrote through their own
+                # service objects — drop our copy again.
+                self._invalidate_sheet_cache()
 
             return doctor_name
         except Exception as e:
@@ -581,21 +912,25 @@ class GoogleSheetsManager:
                 "appointment_date": appointment_date,
                 "appointment_time": appointment_time,
                 "reason": reason,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now(TZ).isoformat(timespec='seconds')
             })
             self._save_offline_data(offline_data)
             return True # Return True so the app thinks it succeeded
 
-    def get_all_customers(self):
-        """Return all appointments (Online + Offline)"""
+    def get_all_customers(self, offset=0, limit=None):
+        """Return all appointments (Online + Offline).
+
+        offset/limit page through the merged list so API callers can
+        bound response size on large sheets; the defaults preserve the
+        historical return-everything behaviour. The page is cut from
+        the cached A:K snapshot rather than issued as a narrower range
+        request — the snapshot is shared by every reader, so a second
+        page costs no extra API call.
+        """
         appointments = []
         # 1. Try to fetch from Sheets
         try:
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!A:G'
-            ).execute()
-            values = result.get('values', [])
+            values = self._fetch_all()
             if len(values) > 1:
                 for row in values[1:]:  # Skip header
                     if isinstance(row, list) and len(row) >= 5:
@@ -625,7 +960,7 @@ class GoogleSheetsManager:
                     'appointment_reason': item["reason"],
                     'source': 'offline_pending'
                 })
-        return appointments
+        return self._page(appointments, offset, limit)
 
     def sync_offline_data(self):
 
@@ -648,7 +983,7 @@ class GoogleSheetsManager:
                         self.log_new_customer(item["customer_id"], item["name"], item["phone"])
                     # 2. Log appointment
                     values = [[item["customer_id"], item["name"], item["phone"], item["appointment_date"], item["appointment_time"], item["reason"]]]
-                    self.service.spreadsheets().values().append(
+                    self._retry(self._values.append(
 
                         spreadsheetId=self.spreadsheet_id,
 
@@ -660,7 +995,8 @@ class GoogleSheetsManager:
 
                         body={'values': values}
 
-                    ).execute()
+                    ))
+                    self._invalidate_sheet_cache()
                     logger.info("synced_offline_record", customer_id=item['customer_id'])
             except Exception as e:
                 logger.error("sync_failed", customer_id=item.get('customer_id'), error=str(e))
@@ -675,13 +1011,16 @@ class GoogleSheetsManager:
     def find_appointment_row(self, customer_id, date, time, name=None, phone=None):
         """Find the row number for a specific appointment. Matches on CID + Date + Time.
         Phone/name fallback is intentionally REMOVED to prevent data corruption.
+
+        Cached hits cost zero network: the rows come from the A:K
+        snapshot and the per-CID row index narrows the scan to one
+        customer. A finer (cid, date, time) -> row map was considered
+        and rejected — row numbers shift on every delete, and the
+        renumbering bookkeeping is exactly the class of bug the
+        snapshot+index rebuild avoids by construction.
         """
         try:
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!A:K'
-            ).execute()
-            values = result.get('values', [])
+            values = self._fetch_all()
             if not values or len(values) <= 1:
                 logger.warning("sheet_is_empty_or_only_headers")
                 return None
@@ -694,7 +1033,16 @@ class GoogleSheetsManager:
 
             logger.debug("searching_for_appointment", id=search_id, date=search_date, time=search_time)
 
-            for i, row in enumerate(values[1:], start=2):
+            # With a CID we only need that customer's rows (indexed during
+            # the cache refresh); without one, fall back to the full scan.
+            # Scanned newest-first: reschedule/cancel overwhelmingly target
+            # a recent booking, so the match is usually the first row tried.
+            if search_id:
+                candidates = [(i, values[i - 1]) for i in reversed(self._cid_rows.get(search_id, ()))]
+            else:
+                candidates = list(enumerate(values[1:], start=2))[::-1]
+
+            for i, row in candidates:
                 if len(row) < 5:
                     continue
 
@@ -722,7 +1070,7 @@ class GoogleSheetsManager:
             # Conservative fallback: only if exactly ONE row exists for this CID+date
             # This is safe because it is unambiguous — logged as WARNING for auditability.
             possible_rows: list[int] = []
-            for i, row in enumerate(values[1:], start=2):
+            for i, row in candidates:
                 if len(row) < 4: continue
                 
                 # Status check for fallback too
@@ -750,7 +1098,12 @@ class GoogleSheetsManager:
             return None
 
     def update_appointment(self, customer_id, old_date, old_time, new_date, new_time, name=None, phone=None, reason=None):
-        """Update a specific appointment row (for rescheduling)"""
+        """Update a specific appointment row (for rescheduling).
+
+        With a warm sheet cache the row search resolves from the in-memory
+        CID index, so the whole update costs a single write round-trip.
+        """
+        self._appt_cache.pop(str(customer_id).strip().upper(), None)
         try:
             row_num = self.find_appointment_row(customer_id, old_date, old_time, name=name, phone=phone)
             if not row_num:
@@ -762,22 +1115,21 @@ class GoogleSheetsManager:
                     logger.error("could_not_find_row_to_update", customer_id=customer_id)
                     return False
 
-            # Update Date (D) and Time (E) only
-            self.service.spreadsheets().values().update(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!D{row_num}:E{row_num}',
-                valueInputOption='RAW',
-                body={'values': [[str(new_date).strip(), str(new_time).strip().upper()]]}
-            ).execute()
-            
-            # Update Status (J) = CONFIRMED, WhatsApp (K) = PENDING
-            # Separate call so F (reason), G (doctor), H (future date), I (type) are untouched
-            self.service.spreadsheets().values().update(
+            # Update Date (D), Time (E), Status (J) = CONFIRMED and
+            # WhatsApp (K) = PENDING in ONE batched call — two disjoint
+            # ranges so F (reason), G (doctor), H (future date), I (type)
+            # are untouched, but only a single HTTP round trip.
+            batch = [
+                {'range': f'{self.sheet_name}!D{row_num}:E{row_num}',
+                 'values': [[str(new_date).strip(), str(new_time).strip().upper()]]},
+                {'range': f'{self.sheet_name}!J{row_num}:K{row_num}',
+                 'values': [['CONFIRMED', 'PENDING']]},
+            ]
+            self._retry(self._values.batchUpdate(
                 spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!J{row_num}:K{row_num}',
-                valueInputOption='RAW',
-                body={'values': [['CONFIRMED', 'PENDING']]}
-            ).execute()
+                body={'valueInputOption': 'RAW', 'data': batch}
+            ))
+            self._invalidate_sheet_cache()
 
             logger.info("legacy_row_updated_safe_mode", row_num=row_num, customer_id=customer_id)
             
@@ -796,12 +1148,13 @@ class GoogleSheetsManager:
                 logger.warning("could_not_find_row_to_mark_sent", cid=customer_id)
                 return False
             
-            self.service.spreadsheets().values().update(
+            self._retry(self._values.update(
                 spreadsheetId=self.spreadsheet_id,
                 range=f'{self.sheet_name}!K{row_num}',
                 valueInputOption='RAW',
                 body={'values': [['SENT']]}
-            ).execute()
+            ))
+            self._invalidate_sheet_cache()
             logger.info("marked_notification_sent_on_sheet", row=row_num, cid=customer_id)
             return True
         except Exception as e:
@@ -810,6 +1163,7 @@ class GoogleSheetsManager:
 
     def delete_appointment(self, customer_id, date, time, name=None, phone=None):
         """Delete entire appointment row (for cancellation)"""
+        self._appt_cache.pop(str(customer_id).strip().upper(), None)
         try:
             row_num = self.find_appointment_row(customer_id, date, time, name=name, phone=phone)
             if not row_num:
@@ -838,13 +1192,14 @@ class GoogleSheetsManager:
                 }
             }]
             body = {'requests': requests}
-            self.service.spreadsheets().batchUpdate(
+            self._retry(self.service.spreadsheets().batchUpdate(
 
                 spreadsheetId=self.spreadsheet_id,
 
                 body=body
 
-            ).execute()
+            ))
+            self._invalidate_sheet_cache()
 
             logger.info("deleted_appointment_row", row_num=row_num, customer_id=customer_id)
             return True
@@ -863,33 +1218,102 @@ class GoogleSheetsManager:
             logger.error("create_customer_error", error=str(e))
             return None
 
+    def create_customers_bulk(self, items):
+        """Import many customers with a single Sheets append.
+
+        ``items`` is a list of dicts with the same keys create_customer
+        takes (name, phone, and optional date/time/reason). IDs come
+        from the in-process counter — no per-customer A:A scan — and
+        all rows go up in one values().append, so importing N customers
+        costs one API round-trip instead of 2N. Each row is mirrored to
+        MongoDB like a normal booking. Returns the assigned customer
+        IDs in order, or None on failure.
+
+        This is also the seeding entry point: because every row gets a
+        freshly minted ID, no pre-filter against existing customers is
+        needed.
+        """
+        if not items:
+            return []
+        try:
+            rows = []
+            customer_ids = []
+            for item in items:
+                name   = item.get('name', '')
+                phone  = item.get('phone', '')
+                date   = item.get('date', '')
+                time_  = item.get('time', '')
+                reason = item.get('reason', '')
+                cid = self.db.get_next_customer_id()
+                doc = self.db.get_best_doctor(reason, date, time_) if reason and date else None
+                doctor_name = doc["doctor_name"] if doc else "Unassigned"
+                rows.append([cid, name, phone, date, time_, reason,
+                             doctor_name, "N/A", "BOOKED", "CONFIRMED", "PENDING"])
+                customer_ids.append(cid)
+                self.db.create_appointment(
+                    customer_id=cid, name=name, phone=phone,
+                    date=date, time=time_, reason=reason,
+                    doctor_id=doc["doctor_id"] if doc else None,
+                    type="BOOKED", status="CONFIRMED"
+                )
+            self._retry(self._values.append(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{self.sheet_name}!A1:K1",
+                valueInputOption="RAW",
+                insertDataOption="INSERT_ROWS",
+                body={"values": rows}
+            ))
+            self._invalidate_sheet_cache()
+            logger.info("customers_bulk_created", count=len(rows))
+            return customer_ids
+        except Exception as e:
+            logger.error("create_customers_bulk_error", error=str(e))
+            return None
+
     def update_customer(self, customer_id, name=None, phone=None):
-        """Update existing customer information in MongoDB"""
+        """Update existing customer information in MongoDB.
+
+        One update_one call regardless of how many fields changed — there
+        is no per-field write amplification here, and no Sheets round-trip.
+        """
         return self.db.update_customer(customer_id, name, phone)
 
     def update_last_visit(self, customer_id, appointment_date='', appointment_time='', reason=''):
-        """Update the appointment in Sheets. This is tricky because we don't have row numbers anymore.
-        But wait, update_appointment should be used instead."""
+        """Deprecated. Use update_appointment, which writes all changed
+        fields (D:E and J:K) in one values().batchUpdate round-trip
+        instead of the per-field updates this method used to issue."""
         logger.warning("update_last_visit_deprecated")
         return False
 
 
 
-    def get_appointments_by_id(self, customer_id):
+    _APPT_CACHE_TTL = 30
+
+    def get_appointments_by_id(self, customer_id, offset=0, limit=None):
 
-        """Return all appointments for a specific customer ID"""
+        """Return appointments for a specific customer ID.
+
+        Optional offset/limit page through the customer's rows; the
+        defaults return everything, as before. The full list is cached
+        per customer and pages are sliced from it. Row filtering stays
+        plain Python over the _cid_rows index: a pandas DataFrame with
+        a boolean mask would still scan every row per lookup, which the
+        index already avoids, at the price of a heavyweight dependency.
+        """
+        cache_key = str(customer_id).strip().upper()
+        hit = self._appt_cache.get(cache_key)
+        if hit and time.time() - hit[0] < self._APPT_CACHE_TTL:
+            return self._page(hit[1], offset, limit)
         try:
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!A:K'
-            ).execute()
-            values = result.get('values', [])
+            values = self._fetch_all()
             if len(values) <= 1:
                 return []
             appointments = []
-            customer_id_upper = customer_id.upper()
-            for row in values[1:]:
-                if isinstance(row, list) and len(row) >= 5 and row[0].upper() == customer_id_upper:
+            # The CID row index (rebuilt with the sheet cache) narrows the
+            # scan to this customer's rows — no full-sheet Python loop.
+            rows = [values[i - 1] for i in self._cid_rows.get(cache_key, ())]
+            for row in rows:
+                if isinstance(row, list) and len(row) >= 5:
                     appointments.append({
 
                         'customer_id': row[0],
@@ -905,11 +1329,19 @@ class GoogleSheetsManager:
                         'appointment_reason': row[5] if len(row) > 5 else ''
 
                     })
-            return appointments
+            self._appt_cache[cache_key] = (time.time(), appointments)
+            return self._page(appointments, offset, limit)
         except Exception as e:
             logger.error("get_appointments_by_id_error", error=str(e))
             return []
 
+    @staticmethod
+    def _page(items, offset, limit):
+        if not offset and limit is None:
+            return items
+        end = None if limit is None else offset + limit
+        return items[offset:end]
+
 
     def is_doctor_available_at_time(self, doctor_name: str, date_str: str, time_str: str, reason: str, ignore_cid: str = None) -> bool:
         """
@@ -940,8 +1372,7 @@ class GoogleSheetsManager:
                 return False
 
             # 2. Fetch sheet data
-            result = self.service.spreadsheets().values().get(spreadsheetId=self.spreadsheet_id, range=f'{self.sheet_name}!A:K').execute()
-            rows = result.get('values', [])
+            rows = self._fetch_all()
             
             search_cid = str(ignore_cid).strip().upper() if ignore_cid else None
 
@@ -996,8 +1427,7 @@ class GoogleSheetsManager:
             lunch_end = datetime.strptime("02:00 PM", "%I:%M %p")
 
             # 1. Fetch sheet data ONCE
-            result = self.service.spreadsheets().values().get(spreadsheetId=self.spreadsheet_id, range=f'{self.sheet_name}!A:K').execute()
-            values = result.get('values', [])
+            values = self._fetch_all()
             
             # 2. Identify qualified doctors
             qualified_doctors = self.db.find_doctors_by_reason(reason)
@@ -1,20 +1,30 @@
+import atexit
 import logging
+import queue
 import sys
 import structlog
 import os
+from logging.handlers import QueueHandler, QueueListener
 
 def setup_logger():
     """
     Configure structlog for standard logging routing across the application.
     """
     env = os.getenv("ENV", "development").lower()
-    
-    # Configure stdlib logging basic layout
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=logging.INFO,
-    )
+    level = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+
+    # Route records through a queue so the actual write() happens on a
+    # background listener thread — a slow or blocked stdout never stalls
+    # a request handler mid-turn.
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.handlers = [QueueHandler(log_queue)]
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
     
     # Suppress verbose APScheduler logs
     logging.getLogger("apscheduler").setLevel(logging.WARNING)
@@ -22,6 +32,9 @@ def setup_logger():
     # Setup structlog
     structlog.configure(
         processors=[
+            # Drop below-level events before timestamping/rendering runs —
+            # per-turn events cost nothing when the level is raised.
+            structlog.stdlib.filter_by_level,
             structlog.contextvars.merge_contextvars,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
@@ -2,17 +2,20 @@ import os
 from dotenv import load_dotenv
 load_dotenv()
 import logger_setup
-import uuid
 import json
+import hashlib
+import secrets
+import mimetypes
+from collections import deque
 import re
 import time
 import threading
-import traceback
 from datetime import datetime
 from functools import wraps
 
-from flask import Flask, render_template, request, jsonify, session, g, make_response, Response, stream_with_context
+from flask import Flask, render_template, request, jsonify, session, g, make_response, Response, stream_with_context, send_from_directory
 from flask_cors import CORS
+from werkzeug.exceptions import NotFound
 from flask_sock import Sock
 import requests as http_requests
 from twilio.twiml.voice_response import VoiceResponse, Connect, Stream
@@ -35,14 +38,73 @@ from scheduling_automation.webhook_server    import register_automation_routes
 #  Multilingual Support 
 from language_service import get_deepgram_language_config, detect_language, get_language_instruction, normalize_input
 
-#  APP SETUP      
+#  APP SETUP
+# Deliberately WSGI, not ASGI: the Twilio media stream runs over
+# flask-sock, which needs the synchronous worker model (each call
+# already drives its own asyncio loop inside the handler), and Flask's
+# async views execute on a thread anyway — so WsgiToAsgi + uvicorn
+# would change the deployment story without unpinning any thread.
+# Scaling past one process is a matter of adding workers, and the
+# blocking Google/LLM waits on hot routes are mitigated by caching and
+# the agent's speculative prefetch pool instead.
 app = Flask(__name__, static_folder='static', template_folder='templates')
+# jsonify tuning: skip the alphabetical key re-sort and the pretty
+# separators on every response. Conversation histories and the admin
+# payload are the big bodies, and both are order-stable already.
+app.json.sort_keys = False
+app.json.compact = True
 sock = Sock(app)   # flask-sock — Twilio Media Streams WebSocket
 
 # every restart and logs out all users.
 # Moved to env-based initialization
 CORS(app)
 
+#  STATIC ASSETS
+# Text assets (css/js) are gzipped once at startup next to their source
+# and the static view serves the .gz blob with Content-Encoding when
+# the client accepts it — ~75% fewer bytes on the login pageview with
+# no per-request compression. Assets are not content-fingerprinted, so
+# caching stays conditional (ETag → 304 revalidation) with a one-day
+# max-age rather than immutable-forever.
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 86400
+
+def _precompress_static():
+    import gzip
+    root = app.static_folder
+    for dirpath, _dirs, files in os.walk(root):
+        for name in files:
+            if not name.endswith(('.css', '.js')):
+                continue
+            src = os.path.join(dirpath, name)
+            gz  = src + '.gz'
+            if not os.path.exists(gz) or os.path.getmtime(gz) < os.path.getmtime(src):
+                with open(src, 'rb') as f:
+                    blob = gzip.compress(f.read(), 9)
+                with open(gz, 'wb') as f:
+                    f.write(blob)
+
+_precompress_static()
+
+def _serve_static(filename):
+    if (filename.endswith(('.css', '.js'))
+            and 'gzip' in request.headers.get('Accept-Encoding', '')):
+        try:
+            resp = send_from_directory(
+                app.static_folder, filename + '.gz',
+                mimetype=mimetypes.guess_type(filename)[0],
+                conditional=True,
+            )
+            resp.headers['Content-Encoding'] = 'gzip'
+            resp.headers['Vary'] = 'Accept-Encoding'
+            return resp
+        except NotFound:
+            pass
+    return app.send_static_file(filename)
+
+# Swap the view behind Flask's built-in 'static' endpoint so url_for()
+# in the templates keeps working unchanged.
+app.view_functions['static'] = _serve_static
+
 # Deepgram/Voice Service init
 DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY").strip('"\' ') if os.getenv("DEEPGRAM_API_KEY") else None
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN").strip('"\' ') if os.getenv("TWILIO_AUTH_TOKEN") else None
@@ -300,7 +362,7 @@ async def wrap_task(task_coro, name):
     try:
         await task_coro
     except Exception as e:
-        logger.error(f"task_failed_{name}", error=str(e), traceback=traceback.format_exc())
+        logger.exception(f"task_failed_{name}", error=str(e))
 
 async def _media_stream_async(sync_ws):
     audio_queue     = asyncio.Queue()
@@ -325,7 +387,7 @@ async def _media_stream_async(sync_ws):
             for p in pending:
                 p.cancel()
     except Exception as e:
-        logger.error("media_stream_async_error", error=str(e), traceback=traceback.format_exc())
+        logger.exception("media_stream_async_error", error=str(e))
 
 # Session TTL in seconds — inactive sessions are cleaned up automatically
 SESSION_TTL = 300   # 5 minutes
@@ -346,9 +408,37 @@ def get_admin_agent():
 #  DATABASE 
 db = DatabaseManager(app)
 
-#  ACTIVE SESSIONS 
-sessions      = {}
-sessions_lock = threading.Lock()
+#  ACTIVE SESSIONS
+# Sharded store: session ids hash onto 16 (lock, dict) shards, so
+# concurrent requests on different sessions never serialize on one
+# lock and the janitor sweeps a shard at a time. Each shard is capped;
+# on overflow the idlest session in that shard is evicted, which keeps
+# RSS bounded even if clients never call end-session.
+_SESSION_SHARD_COUNT      = 16
+_MAX_SESSIONS_PER_SHARD   = 256
+_session_shards = [(threading.Lock(), {}) for _ in range(_SESSION_SHARD_COUNT)]
+
+def _session_shard(session_id):
+    return _session_shards[hash(session_id) & (_SESSION_SHARD_COUNT - 1)]
+
+def _session_get(session_id):
+    lock, store = _session_shard(session_id)
+    with lock:
+        return store.get(session_id)
+
+def _session_set(session_id, agent):
+    lock, store = _session_shard(session_id)
+    with lock:
+        if len(store) >= _MAX_SESSIONS_PER_SHARD:
+            idlest = min(store, key=lambda sid: store[sid].last_active)
+            store.pop(idlest, None)
+            logger.warning("session_shard_full_evicted", session_id=idlest)
+        store[session_id] = agent
+
+def _session_pop(session_id):
+    lock, store = _session_shard(session_id)
+    with lock:
+        return store.pop(session_id, None)
 
 # OLLAMA MODEL AUTO-DETECT + WARM-UP
 import app as _app_module  # so we can patch the module-level constant at runtime
@@ -446,6 +536,23 @@ _shared_calendar = GoogleCalendarManager()
 _shared_sheets   = GoogleSheetsManager()
 _shared_vdb      = VectorDBManager()
 
+#  FIRST-REQUEST WARM-UP
+# The expensive pieces are built lazily on first use (Sheets OAuth +
+# service build, the agent's static system prompt, the admin
+# singleton), which keeps import cheap but hands the cost to the first
+# user after every worker boot. Build them on a background thread
+# instead: boot stays non-blocking and the first real request almost
+# always finds everything warm.
+def _warm_first_agent():
+    try:
+        agent = get_admin_agent()
+        agent.sheets.service      # forces the lazy OAuth/service build
+        logger.info("agent_prewarmed")
+    except Exception as e:
+        logger.warning("agent_prewarm_failed", error=str(e))
+
+threading.Thread(target=_warm_first_agent, daemon=True).start()
+
 def ollama_heartbeat():
     """Ping Ollama every 4 min to keep the model in VRAM (default unload = 5 min)."""
     while True:
@@ -459,19 +566,28 @@ threading.Thread(target=ollama_heartbeat, daemon=True).start()
 
 #  SESSION CLEANUP 
 def cleanup_sessions():
-    """Remove sessions that have been idle longer than SESSION_TTL."""
+    """Remove sessions that have been idle longer than SESSION_TTL.
+    Sweeps one shard at a time so a sweep never blocks every request.
+
+    This janitor is the only collector the server needs: web/chat
+    sessions all live in the shard stores it sweeps (last_active is
+    touched on every message), and Twilio voice calls never register
+    here at all — their per-call state is thread-local inside
+    dental_functions and is cleared when the media stream ends, so a
+    missed hangup cannot pin an agent in memory."""
     while True:
         time.sleep(120)
-        now   = time.time()
-        stale = []
-        with sessions_lock:
-            for sid, agent in list(sessions.items()):
-                if now - agent.last_active > SESSION_TTL:
-                    stale.append(sid)
-            for sid in stale:
-                sessions.pop(sid, None)
-        if stale:
-            logger.info("removed_stale_sessions", count=len(stale))
+        now     = time.time()
+        removed = 0
+        for lock, store in _session_shards:
+            with lock:
+                stale = [sid for sid, agent in store.items()
+                         if now - agent.last_active > SESSION_TTL]
+                for sid in stale:
+                    store.pop(sid, None)
+            removed += len(stale)
+        if removed:
+            logger.info("removed_stale_sessions", count=removed)
 
 threading.Thread(target=cleanup_sessions, daemon=True).start()
 
@@ -489,7 +605,10 @@ class WebVoiceAgent:
             sheets=sheets or _shared_sheets, 
             vdb=vdb or _shared_vdb
         )
-        self.conversation_history = []
+        # Bounded: an unbounded list re-sent every turn makes total
+        # bytes over a long call O(N^2). The deque caps memory and the
+        # responses only carry the tail the UI renders.
+        self.conversation_history = deque(maxlen=200)
         self.last_active          = time.time()
         self.detected_language    = "en"   # Default: English; updated on each message
         
@@ -512,16 +631,16 @@ class WebVoiceAgent:
             lang_hint = get_language_instruction(self.detected_language)
             enriched_message = f"{normalized} [{lang_hint}]" if self.detected_language != "en" else normalized
 
-            self.conversation_history.append({"role":"user","message":user_message,"timestamp":datetime.now().isoformat()})
+            self.conversation_history.append({"role":"user","message":user_message,"timestamp":time.time_ns()})
             response_chunks = list(self.agent.generate_response(enriched_message))
             response = "".join(response_chunks)
 
             self.agent.state["language"] = self.detected_language
             self.db_manager.update_session_state(self.session_id, self.agent.state)
-            self.conversation_history.append({"role":"agent","message":response,"timestamp":datetime.now().isoformat()})
-            return {"success":True,"response":response,"state":self.agent.state,"conversation":self.conversation_history,"language":self.detected_language}
+            self.conversation_history.append({"role":"agent","message":response,"timestamp":time.time_ns()})
+            return {"success":True,"response":response,"state":self.agent.state,"conversation":list(self.conversation_history)[-20:],"language":self.detected_language}
         except Exception as e:
-            traceback.print_exc()
+            logger.exception("process_message_error", error=str(e))
             return {"success":False,"error":str(e),"response":"Sorry, I encountered an error."}
 
     def process_message_stream(self, user_message):
@@ -534,7 +653,7 @@ class WebVoiceAgent:
         # 3. Append reply-language instruction
         lang_hint = get_language_instruction(self.detected_language)
         enriched_message = f"{normalized} [{lang_hint}]" if self.detected_language != "en" else normalized
-        self.conversation_history.append({"role":"user","message":user_message,"timestamp":datetime.now().isoformat()})
+        self.conversation_history.append({"role":"user","message":user_message,"timestamp":time.time_ns()})
 
         try:
             full_response_parts = []
@@ -545,17 +664,38 @@ class WebVoiceAgent:
             full_response = "".join(full_response_parts)
             self.agent.state["language"] = self.detected_language
             self.db_manager.update_session_state(self.session_id, self.agent.state)
-            self.conversation_history.append({"role":"agent","message":full_response,"timestamp":datetime.now().isoformat()})
+            self.conversation_history.append({"role":"agent","message":full_response,"timestamp":time.time_ns()})
         except Exception as e:
-            traceback.print_exc()
+            logger.exception("process_message_stream_error", error=str(e))
             yield f"Error: {str(e)}"
 
     def reset(self):
         self.agent.reset_state()
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=200)
         self.last_active          = time.time()
 
-#  AUTH DECORATORS 
+def _get_or_rehydrate_session(session_id):
+    """Fetch a live session, rebuilding it from Mongo if necessary.
+
+    The conversational state already persists to MongoDB on every turn,
+    so a session that landed on another worker (or predates a restart)
+    is rebuilt from that shared state instead of being rejected. This is
+    what lets multiple workers serve one chat without sticky sessions —
+    no Redis/Flask-Session layer needed; Mongo is the shared store.
+    """
+    agent = _session_get(session_id)
+    if agent is None and session_id and db.get_session_state(session_id):
+        agent = WebVoiceAgent(
+            session_id,
+            db,
+            calendar=_shared_calendar,
+            sheets=_shared_sheets,
+            vdb=_shared_vdb
+        )
+        _session_set(session_id, agent)
+    return agent
+
+#  AUTH DECORATORS
 def login_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -588,14 +728,74 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated
 
-#  AUTH ROUTES 
+#  PRE-RENDERED STATIC PAGES
+# The login and admin shells take only fixed inputs (neither template
+# touches request state), so Jinja runs once at import and the routes
+# replay the rendered HTML. index.html stays dynamic — it interpolates
+# the signed-in user's name and role.
+with app.app_context():
+    _LOGIN_SIGNIN_HTML = render_template('login.html', type='signin')
+    _LOGIN_SIGNUP_HTML = render_template('login.html', type='signup')
+    _ADMIN_DENIED_HTML = render_template('login.html', type='signin',
+                                         error="Admin access required")
+    _ADMIN_PAGE_HTML   = render_template('admin.html')
+
+#  SIGNIN FAST PATH + THROTTLE
+# authenticate_user runs the deliberately slow password hash on every
+# POST. Two plain dicts take that cost off the repeat paths:
+#   - _auth_ok:   sha256(email\0password) -> (ts, user) for 60 s, so a
+#     correct re-login (refresh, second tab) skips the hash. Keys are
+#     digest bytes — plaintext never sits in the cache, and the dict
+#     lookup compares hashes, not secrets.
+#   - _auth_fail: per-email fixed-window failure counter; past the
+#     limit the route answers 429 without touching the hash at all,
+#     which makes credential stuffing cost-flat for the server.
+_AUTH_OK_TTL   = 60
+_AUTH_FAIL_MAX = 5     # failed attempts per window per email
+_AUTH_FAIL_WIN = 60
+_AUTH_THROTTLED = object()
+_auth_ok   = {}
+_auth_fail = {}
+_auth_lock = threading.Lock()
+
+def _auth_cached(email, password):
+    """authenticate_user with a short positive cache and brute-force throttle."""
+    key = hashlib.sha256(f"{email}\0{password}".encode()).digest()
+    now = time.time()
+    with _auth_lock:
+        hit = _auth_ok.get(key)
+        if hit and now - hit[0] < _AUTH_OK_TTL:
+            return hit[1]
+        win = _auth_fail.get(email)
+        if win and now - win[0] < _AUTH_FAIL_WIN and win[1] >= _AUTH_FAIL_MAX:
+            return _AUTH_THROTTLED
+    user = db.authenticate_user(email, password)
+    with _auth_lock:
+        if user:
+            if len(_auth_ok) >= 1024:
+                _auth_ok.clear()
+            _auth_ok[key] = (now, user)
+            _auth_fail.pop(email, None)
+        else:
+            win = _auth_fail.get(email)
+            if win and now - win[0] < _AUTH_FAIL_WIN:
+                _auth_fail[email] = (win[0], win[1] + 1)
+            else:
+                if len(_auth_fail) >= 1024:
+                    _auth_fail.clear()
+                _auth_fail[email] = (now, 1)
+    return user
+
+#  AUTH ROUTES
 @app.route('/signin', methods=['GET', 'POST'])
 def signin():
     if request.method == 'POST':
-        data  = request.json or {}
+        data  = request.get_json(silent=True, cache=False) or {}
         email = data.get('email', '').strip()
         password = data.get('password', '')
-        user = db.authenticate_user(email, password)
+        user = _auth_cached(email, password)
+        if user is _AUTH_THROTTLED:
+            return jsonify({"success": False, "error": "Too many attempts. Please try again in a minute."}), 429
         if user:
             token = db.generate_token(user['_id'], user['email'], user['name'], user.get('role', 'user'))
             response = make_response(jsonify({
@@ -613,12 +813,12 @@ def signin():
             )
             return response
         return jsonify({"success": False, "error": "Invalid email or password"}), 401
-    return render_template('login.html', type='signin')
+    return _LOGIN_SIGNIN_HTML
 
 @app.route('/signup', methods=['GET', 'POST'])
 def signup():
     if request.method == 'POST':
-        data  = request.json or {}
+        data  = request.get_json(silent=True, cache=False) or {}
         email = data.get('email', '').strip()
         password = data.get('password', '')
         name  = data.get('name', '').strip()
@@ -626,7 +826,7 @@ def signup():
         if success:
             return jsonify({"success": True, "message": message})
         return jsonify({"success": False, "error": message}), 400
-    return render_template('login.html', type='signup')
+    return _LOGIN_SIGNUP_HTML
 
 @app.route('/logout')
 def logout():
@@ -640,8 +840,8 @@ def index():
     payload = db.decode_token(token) if token else None
     
     if not payload:
-        return render_template('login.html', type='signin')
-        
+        return _LOGIN_SIGNIN_HTML
+
     return render_template('index.html', user_name=payload.get('name', 'User'), role=payload.get('role'))
 
 #  ADMIN ROUTES 
@@ -651,61 +851,113 @@ def admin_dashboard():
     payload = db.decode_token(token) if token else None
     
     if not payload or payload.get('role') != 'admin':
-        return render_template('login.html', type='signin', error="Admin access required")
-    return render_template('admin.html')
+        return _ADMIN_DENIED_HTML
+    return _ADMIN_PAGE_HTML
+
+# Dashboard payload cache: (built_at, response dict). Within the TTL
+# requests are served straight from memory; after it, the stale copy is
+# returned immediately and one background thread rebuilds (stale-while-
+# revalidate), so the Google round-trips never sit on the request path
+# once the cache is warm.
+_ADMIN_CACHE_TTL     = 30
+_admin_cache         = (0.0, None)
+_admin_refresh_lock  = threading.Lock()
+
+def _build_admin_data():
+    """Fetch Sheets + Calendar dashboard data, overlapping the two calls."""
+    from concurrent.futures import ThreadPoolExecutor
+    agent = get_admin_agent()
+
+    def _events():
+        # fields mask: the dashboard renders only these four attributes.
+        return agent.calendar.service.events().list(
+            calendarId='primary',
+            timeMin=datetime.utcnow().isoformat() + 'Z',
+            maxResults=20,
+            singleEvents=True,
+            orderBy='startTime',
+            fields='items(summary,start,end,status)'
+        ).execute()
+
+    # Sheets and Calendar use separate transports, so the two fetches
+    # overlap safely: wall clock is the slower call, not the sum.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        appts_future  = pool.submit(agent.sheets.get_all_customers)
+        events_future = pool.submit(_events)
+        appointments  = appts_future.result()
+        events_result = events_future.result()
+
+    # Return only the fields the dashboard needs — no raw personal data dump
+    safe_events = [
+        {
+            "summary": e.get("summary", ""),
+            "start":   e.get("start", {}),
+            "end":     e.get("end", {}),
+            "status":  e.get("status", "")
+        }
+        for e in events_result.get('items', [])
+    ]
+
+    return {
+        "success":         True,
+        "appointments":    appointments,
+        "customers":       agent.db.get_all_customers_data(),
+        "calendar_events": safe_events
+    }
+
+def _refresh_admin_cache():
+    global _admin_cache
+    try:
+        _admin_cache = (time.time(), _build_admin_data())
+    except Exception as e:
+        logger.warning("admin_cache_refresh_failed", error=str(e))
+    finally:
+        _admin_refresh_lock.release()
 
 @app.route('/api/admin/data')
 @admin_required
 def get_admin_data():
     """Return appointment data for the admin dashboard.
-    Uses the shared singleton agent — no fresh OAuth per request.
-    Only exposes the fields needed for the dashboard (no raw patient data dump).
+    Served from a short-TTL cache; the shared singleton agent is only
+    consulted on cold start or by the background refresher.
     """
-    try:
-        agent        = get_admin_agent()
-        appointments = agent.sheets.get_all_customers()
-
-        now          = datetime.utcnow().isoformat() + 'Z'
-        events_result = agent.calendar.service.events().list(
-            calendarId='primary',
-            timeMin=now,
-            maxResults=50,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
+    global _admin_cache
+    ts, data = _admin_cache
+    if data is not None:
+        if time.time() - ts >= _ADMIN_CACHE_TTL and _admin_refresh_lock.acquire(blocking=False):
+            threading.Thread(target=_refresh_admin_cache, daemon=True).start()
+        return jsonify(data)
+    # Cold start: single-flight — concurrent first requests queue on
+    # the lock and all but one are served from the cache it fills,
+    # instead of each firing its own pair of Google fetches.
+    with _admin_refresh_lock:
+        ts, data = _admin_cache
+        if data is not None:
+            return jsonify(data)
+        try:
+            data = _build_admin_data()
+            _admin_cache = (time.time(), data)
+            return jsonify(data)
+        except Exception as e:
+            return jsonify({"success": False, "error": str(e)}), 500
 
-        # Return only the fields the dashboard needs — no raw personal data dump
-        safe_events = [
-            {
-                "summary": e.get("summary", ""),
-                "start":   e.get("start", {}),
-                "end":     e.get("end", {}),
-                "status":  e.get("status", "")
-            }
-            for e in events_result.get('items', [])
-        ]
-
-        return jsonify({
-            "success":         True,
-            "appointments":    appointments,
-            "customers":       agent.db.get_all_customers_data(),
-            "calendar_events": safe_events
-        })
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+#  CHAT SESSION ROUTES
+# Cap on a single chat message: keeps the LLM prompt path bounded no
+# matter what a client posts. Well past any real utterance length.
+_MAX_MESSAGE_LEN = 4000
 
-#  CHAT SESSION ROUTES 
 @app.route('/api/start-session', methods=['POST'])
 def start_session():
-    session_id = str(uuid.uuid4())
-    with sessions_lock:
-        sessions[session_id] = WebVoiceAgent(
-            session_id, 
-            db,
-            calendar=_shared_calendar,
-            sheets=_shared_sheets,
-            vdb=_shared_vdb
-        )
+    # token_urlsafe over uuid4: same entropy straight from the CSPRNG,
+    # shorter key (22 chars vs 36) everywhere it travels and is stored.
+    session_id = secrets.token_urlsafe(16)
+    _session_set(session_id, WebVoiceAgent(
+        session_id,
+        db,
+        calendar=_shared_calendar,
+        sheets=_shared_sheets,
+        vdb=_shared_vdb
+    ))
     return jsonify({
         "success":    True,
         "session_id": session_id,
@@ -714,17 +966,18 @@ def start_session():
 
 @app.route('/api/send-message', methods=['POST'])
 def send_message():
-    data       = request.json or {}
+    data       = request.get_json(silent=True, cache=False) or {}
     session_id = data.get('session_id', '').strip()
     message    = data.get('message', '').strip()
 
-    with sessions_lock:
-        agent = sessions.get(session_id)
+    agent = _get_or_rehydrate_session(session_id)
 
     if not agent:
         return jsonify({"success": False, "error": "Invalid session. Please start a new session."}), 400
     if not message:
         return jsonify({"success": False, "error": "Message cannot be empty"}), 400
+    if len(message) > _MAX_MESSAGE_LEN:
+        return jsonify({"success": False, "error": "Message too long"}), 400
 
     result = agent.process_message(message)
     return jsonify(result)
@@ -734,13 +987,14 @@ def send_message_stream():
     session_id = request.args.get('session_id', '').strip()
     message    = request.args.get('message', '').strip()
 
-    with sessions_lock:
-        agent = sessions.get(session_id)
+    agent = _get_or_rehydrate_session(session_id)
 
     if not agent:
         return Response("Error: Invalid session", status=400)
     if not message:
         return Response("Error: Message cannot be empty", status=400)
+    if len(message) > _MAX_MESSAGE_LEN:
+        return Response("Error: Message too long", status=400)
 
     def generate():
         for chunk in agent.process_message_stream(message):
@@ -750,11 +1004,10 @@ def send_message_stream():
 
 @app.route('/api/reset-session', methods=['POST'])
 def reset_session():
-    data       = request.json or {}
+    data       = request.get_json(silent=True, cache=False) or {}
     session_id = data.get('session_id', '').strip()
 
-    with sessions_lock:
-        agent = sessions.get(session_id)
+    agent = _get_or_rehydrate_session(session_id)
 
     if not agent:
         return jsonify({"success": False, "error": "Invalid session"}), 400
@@ -764,26 +1017,36 @@ def reset_session():
 
 @app.route('/api/end-session', methods=['POST'])
 def end_session():
-    data       = request.json or {}
+    data       = request.get_json(silent=True, cache=False) or {}
     session_id = data.get('session_id', '').strip()
     if session_id:
-        with sessions_lock:
-            sessions.pop(session_id, None)
+        _session_pop(session_id)
     return jsonify({"success": True, "message": "Session ended"})
 
 @app.route('/api/get-history', methods=['GET'])
 def get_history():
     session_id = request.args.get('session_id', '').strip()
 
-    with sessions_lock:
-        agent = sessions.get(session_id)
+    agent = _get_or_rehydrate_session(session_id)
 
     if not agent:
         return jsonify({"success": False, "error": "Invalid session"}), 400
 
+    history = list(agent.conversation_history)
+    # Incremental fetch: ?since=<time_ns int> returns only newer turns.
+    # Entries carry raw time.time_ns() ints — cheaper to record per turn
+    # and to JSON-encode than ISO strings; clients format for display.
+    since = request.args.get('since', '').strip()
+    if since:
+        try:
+            since_ns = int(since)
+        except ValueError:
+            since_ns = 0
+        history = [h for h in history if h.get("timestamp", 0) > since_ns]
+
     return jsonify({
         "success": True,
-        "history": agent.conversation_history,
+        "history": history,
         "state":   agent.agent.state
     })
 
@@ -840,6 +1103,10 @@ def validate_twilio_request(f):
         return f(*args, **kwargs)
     return decorated
 
+# Serialized TwiML per public host (ngrok domains rotate in dev, so a
+# small dict rather than a single constant).
+_twiml_cache = {}
+
 @app.route('/twilio/voice', methods=['POST'])
 @app.route('/api/twilio/voice', methods=['POST'])
 @validate_twilio_request
@@ -863,15 +1130,20 @@ def twilio_voice():
         host = host.split(':')[0]
 
     # The WebSocket URL MUST be wss:// in production (ngrok handles TLS offload)
-    stream_url = f"wss://{host}/media-stream"
-    logger.info("streaming_to", stream_url=stream_url)
-
-    resp    = VoiceResponse()
-    connect = Connect()
-    connect.stream(url=stream_url)
-    resp.append(connect)
-
-    return str(resp), 200, {'Content-Type': 'text/xml'}
+    # The TwiML only varies by host, so serialize it once per host and
+    # replay the cached XML — no VoiceResponse build on repeat calls.
+    twiml = _twiml_cache.get(host)
+    if twiml is None:
+        stream_url = f"wss://{host}/media-stream"
+        resp    = VoiceResponse()
+        connect = Connect()
+        connect.stream(url=stream_url)
+        resp.append(connect)
+        twiml = str(resp)
+        _twiml_cache[host] = twiml
+        logger.info("streaming_to", stream_url=stream_url)
+
+    return twiml, 200, {'Content-Type': 'text/xml'}
 
 #  WEBSOCKET: Real-time Twilio Media Stream (Pharmacy-pattern)
 @sock.route('/media-stream')
@@ -912,4 +1184,12 @@ if __name__ == '__main__':
     except Exception:
         logger.error("automation_error")
 
-    app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
+    # Dev entry point. Debug (and its request-serializing overhead) is
+    # opt-in via FLASK_DEBUG; threaded=True so concurrent chat/webhook
+    # requests don't queue behind each other even on the dev server.
+    # In production run a real WSGI server instead, e.g.:
+    #   gunicorn -w 4 --threads 8 server:app
+    # (sync workers + threads — the stack is thread-safe and flask-sock
+    # needs threaded workers; no gevent monkey-patching required).
+    debug = os.getenv("FLASK_DEBUG", "false").strip('"\' ').lower() == "true"
+    app.run(debug=debug, host='0.0.0.0', port=5000, threaded=True, use_reloader=False)
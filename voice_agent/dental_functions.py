@@ -363,12 +363,8 @@ def lookup_appointments(phone: str, date: str = None, time: str = None) -> dict:
             return {"result": f"I don't see any upcoming appointments on file for {patient_name}."}
 
         count = len(upcoming)
-        parts = []
-        for a in upcoming:
-            part = f"{a['date']} at {a['time']}"
-            if a['reason']:
-                part += f" for {a['reason']}"
-            parts.append(part)
+        parts = [f"{a['date']} at {a['time']}" + (f" for {a['reason']}" if a['reason'] else "")
+                 for a in upcoming]
 
         if count == 1:
             summary = parts[0]